@@ -1,10 +1,19 @@
 import { NextRequest, NextResponse } from "next/server";
 import { fetchAll, execute } from "@/lib/db";
 import { validateToken } from "@/lib/auth";
+import { isBotRequest, notifyBot } from "@/lib/bot";
 
-// GET /api/announcements - List all announcements
-export async function GET() {
+// GET /api/announcements - List all announcements (?pending=true: not yet sent, oldest first)
+export async function GET(request: NextRequest) {
     try {
+        const { searchParams } = new URL(request.url);
+        if (searchParams.get("pending") === "true") {
+            const pending = await fetchAll(
+                "SELECT * FROM announcements WHERE sent_at IS NULL ORDER BY created_at ASC"
+            );
+            return NextResponse.json(pending);
+        }
+
         const announcements = await fetchAll(
             "SELECT * FROM announcements ORDER BY created_at DESC"
         );
@@ -15,7 +24,7 @@ export async function GET() {
     }
 }
 
-// POST /api/announcements - Create announcement
+// POST /api/announcements - Create announcement (scheduled_at: fest-local time to send at, empty for now)
 export async function POST(request: NextRequest) {
     try {
         const authHeader = request.headers.get("authorization");
@@ -23,18 +32,20 @@ export async function POST(request: NextRequest) {
             return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
         }
 
-        const { title, message, priority } = await request.json();
+        const { title, message, priority, scheduled_at } = await request.json();
 
         if (!message) {
             return NextResponse.json({ detail: "Message is required" }, { status: 400 });
         }
 
         await execute(
-            `INSERT INTO announcements (title, message, priority, created_at)
-             VALUES (?, ?, ?, datetime('now'))`,
-            [title || "Announcement", message, priority || "normal"]
+            `INSERT INTO announcements (title, message, priority, scheduled_at, created_at)
+             VALUES (?, ?, ?, ?, datetime('now'))`,
+            [title || "Announcement", message, priority || "normal", scheduled_at || null]
         );
 
+        await notifyBot("announcements");
+
         return NextResponse.json({ message: "Announcement created" });
     } catch (error) {
         console.error("Create announcement error:", error);
@@ -42,6 +53,34 @@ export async function POST(request: NextRequest) {
     }
 }
 
+// PATCH /api/announcements - Broadcast progress checkpoint from the bot
+export async function PATCH(request: NextRequest) {
+    try {
+        if (!isBotRequest(request)) {
+            return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
+        }
+
+        const { id, delivery_cursor, delivered_count, sent } = await request.json();
+
+        if (!id) {
+            return NextResponse.json({ detail: "ID is required" }, { status: 400 });
+        }
+
+        await execute(
+            `UPDATE announcements
+             SET delivery_cursor = ?, delivered_count = ?,
+                 sent_at = CASE WHEN ? THEN datetime('now') ELSE sent_at END
+             WHERE id = ?`,
+            [delivery_cursor || 0, delivered_count || 0, sent ? 1 : 0, id]
+        );
+
+        return NextResponse.json({ message: "Checkpoint saved" });
+    } catch (error) {
+        console.error("Announcement checkpoint error:", error);
+        return NextResponse.json({ detail: "Internal server error" }, { status: 500 });
+    }
+}
+
 // DELETE /api/announcements - Delete announcement (with id in body)
 export async function DELETE(request: NextRequest) {
     try {
@@ -58,6 +97,9 @@ export async function DELETE(request: NextRequest) {
 
         await execute("DELETE FROM announcements WHERE id = ?", [id]);
 
+        // Cancels the bot's timer if it was scheduled
+        await notifyBot("announcements");
+
         return NextResponse.json({ message: "Announcement deleted" });
     } catch (error) {
         console.error("Delete announcement error:", error);
@@ -0,0 +1,58 @@
+import { NextRequest, NextResponse } from "next/server";
+import { execute } from "@/lib/db";
+import { isBotRequest } from "@/lib/bot";
+import { InValue } from "@libsql/client";
+
+const MAX_BATCH = 500;
+
+interface BotUser {
+    telegram_id: number;
+    username?: string | null;
+    seen_at?: string;
+}
+
+// POST /api/auth/register-bot-users - Register users and bump last_active in bulk
+// The bot queues /start calls and sends them here in batches.
+export async function POST(request: NextRequest) {
+    try {
+        if (!isBotRequest(request)) {
+            return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
+        }
+
+        const { users } = await request.json();
+
+        if (!Array.isArray(users) || users.length === 0) {
+            return NextResponse.json({ detail: "users array required" }, { status: 400 });
+        }
+        if (users.length > MAX_BATCH) {
+            return NextResponse.json({ detail: `At most ${MAX_BATCH} users per batch` }, { status: 400 });
+        }
+
+        const valid = (users as BotUser[]).filter((u) => u && u.telegram_id);
+        if (valid.length === 0) {
+            return NextResponse.json({ message: "Users registered", count: 0 });
+        }
+
+        // One multi-row upsert: new users are inserted, known users get last_active
+        // (and a changed username) updated
+        const rows: string[] = [];
+        const params: InValue[] = [];
+        for (const u of valid) {
+            rows.push("(?, ?, COALESCE(?, datetime('now')), COALESCE(?, datetime('now')))");
+            params.push(u.telegram_id, u.username || null, u.seen_at || null, u.seen_at || null);
+        }
+
+        await execute(
+            `INSERT INTO users (telegram_id, username, created_at, last_active) VALUES ${rows.join(", ")}
+             ON CONFLICT(telegram_id) DO UPDATE SET
+                 username = COALESCE(excluded.username, users.username),
+                 last_active = MAX(COALESCE(users.last_active, ''), excluded.last_active)`,
+            params
+        );
+
+        return NextResponse.json({ message: "Users registered", count: valid.length });
+    } catch (error) {
+        console.error("Bulk register bot users error:", error);
+        return NextResponse.json({ detail: "Internal server error" }, { status: 500 });
+    }
+}
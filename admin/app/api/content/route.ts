@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from "next/server";
 import { fetchAll, fetchOne, execute } from "@/lib/db";
 import { validateToken } from "@/lib/auth";
+import { notifyBot } from "@/lib/bot";
 
 // GET /api/content - List all content or get by key
 export async function GET(request: NextRequest) {
@@ -55,6 +56,8 @@ export async function POST(request: NextRequest) {
             );
         }
 
+        await notifyBot("content");
+
         return NextResponse.json({ message: "Content saved", key });
     } catch (error) {
         console.error("Save content error:", error);
@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from "next/server";
 import { fetchOne, execute } from "@/lib/db";
 import { validateToken } from "@/lib/auth";
+import { notifyBot } from "@/lib/bot";
 import { InValue } from "@libsql/client";
 
 interface RouteParams {
@@ -74,12 +75,17 @@ export async function PUT(request: NextRequest, { params }: RouteParams) {
         }
 
         if (updates.length > 0) {
+            updates.push("updated_at = datetime('now')");
             values.push(id);
             await execute(`UPDATE events SET ${updates.join(", ")} WHERE id = ?`, values);
+            await notifyBot("events");
         }
 
         return NextResponse.json({ message: "Event updated", id });
     } catch (error) {
+        if (String(error).includes("UNIQUE constraint failed: events.name")) {
+            return NextResponse.json({ detail: "An event with this name already exists" }, { status: 409 });
+        }
         console.error("Update event error:", error);
         return NextResponse.json(
             { detail: "Internal server error" },
@@ -108,6 +114,13 @@ export async function DELETE(request: NextRequest, { params }: RouteParams) {
         }
 
         await execute("DELETE FROM events WHERE id = ?", [id]);
+        // Lets /api/sync report the deletion to incremental clients
+        await execute(
+            "INSERT OR REPLACE INTO event_tombstones (event_id, deleted_at) VALUES (?, datetime('now'))",
+            [id]
+        );
+
+        await notifyBot("events");
 
         return NextResponse.json({ message: "Event deleted", id });
     } catch (error) {
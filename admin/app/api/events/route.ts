@@ -1,14 +1,31 @@
 import { NextRequest, NextResponse } from "next/server";
 import { fetchAll, execute } from "@/lib/db";
 import { validateToken } from "@/lib/auth";
+import { notifyBot } from "@/lib/bot";
 import { InValue } from "@libsql/client";
 
+// Keyset cursor for paginated listing: base64url("start_time|id")
+function encodeCursor(startTime: string, id: number): string {
+    return Buffer.from(`${startTime}|${id}`).toString("base64url");
+}
+
+function decodeCursor(cursor: string): [string, number] | null {
+    const raw = Buffer.from(cursor, "base64url").toString();
+    const sep = raw.lastIndexOf("|");
+    const id = Number(raw.slice(sep + 1));
+    if (sep < 0 || !Number.isInteger(id)) return null;
+    return [raw.slice(0, sep), id];
+}
+
 // GET /api/events - List all events
+// With ?limit=N returns one page ({ events, next_cursor }); pass ?cursor=next_cursor for the next page
 export async function GET(request: NextRequest) {
     try {
         const { searchParams } = new URL(request.url);
         const category = searchParams.get("category");
         const activeOnly = searchParams.get("active_only") === "true";
+        const limitParam = searchParams.get("limit");
+        const cursor = searchParams.get("cursor");
 
         let sql = "SELECT * FROM events WHERE 1=1";
         const params: InValue[] = [];
@@ -21,10 +38,33 @@ export async function GET(request: NextRequest) {
             params.push(category);
         }
 
-        sql += " ORDER BY start_time ASC";
+        if (!limitParam) {
+            sql += " ORDER BY start_time ASC, id ASC";
+            const events = await fetchAll(sql, params);
+            return NextResponse.json(events);
+        }
 
-        const events = await fetchAll(sql, params);
-        return NextResponse.json(events);
+        const limit = Math.min(Math.max(parseInt(limitParam, 10) || 20, 1), 100);
+        if (cursor) {
+            const after = decodeCursor(cursor);
+            if (!after) {
+                return NextResponse.json({ detail: "Invalid cursor" }, { status: 400 });
+            }
+            // Seek past the last row of the previous page (uses idx_events_start)
+            sql += " AND (start_time > ? OR (start_time = ? AND id > ?))";
+            params.push(after[0], after[0], after[1]);
+        }
+
+        // One extra row tells us whether there is a next page
+        sql += " ORDER BY start_time ASC, id ASC LIMIT ?";
+        params.push(limit + 1);
+
+        const rows = await fetchAll<{ id: number; start_time: string }>(sql, params);
+        const events = rows.slice(0, limit);
+        const last = events[events.length - 1];
+        const nextCursor = rows.length > limit && last ? encodeCursor(last.start_time, last.id) : null;
+
+        return NextResponse.json({ events, next_cursor: nextCursor });
     } catch (error) {
         console.error("List events error:", error);
         return NextResponse.json(
@@ -54,8 +94,8 @@ export async function POST(request: NextRequest) {
         };
 
         await execute(
-            `INSERT INTO events (name, category, description, venue, start_time, end_time, rules, hashtags, volunteer_contacts, poster_caption, poster_file_id, registration_fee, registration_link, is_active)
-             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)`,
+            `INSERT INTO events (name, category, description, venue, start_time, end_time, rules, hashtags, volunteer_contacts, poster_caption, poster_file_id, registration_fee, registration_link, is_active, updated_at)
+             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))`,
             [
                 sanitize(data.name),
                 sanitize(data.category),
@@ -74,8 +114,13 @@ export async function POST(request: NextRequest) {
             ]
         );
 
+        await notifyBot("events");
+
         return NextResponse.json({ message: "Event created", name: data.name });
     } catch (error) {
+        if (String(error).includes("UNIQUE constraint failed: events.name")) {
+            return NextResponse.json({ detail: "An event with this name already exists" }, { status: 409 });
+        }
         console.error("Create event error:", error);
         return NextResponse.json(
             { detail: "Internal server error" },
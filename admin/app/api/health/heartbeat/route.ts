@@ -0,0 +1,62 @@
+import { NextRequest, NextResponse } from "next/server";
+import { fetchOne, execute } from "@/lib/db";
+import { validateToken } from "@/lib/auth";
+import { isBotRequest } from "@/lib/bot";
+
+// The bot reports every HEALTH_CHECK_INTERVAL (30s); a few missed reports means it is down
+const STALE_AFTER_SECONDS = Number(process.env.BOT_HEARTBEAT_STALE_SECONDS || 120);
+
+// POST /api/health/heartbeat - Bot reports its health snapshot
+export async function POST(request: NextRequest) {
+    try {
+        if (!isBotRequest(request)) {
+            return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
+        }
+
+        const report = await request.json();
+        if (!report || typeof report !== "object" || Array.isArray(report)) {
+            return NextResponse.json({ detail: "Health report object required" }, { status: 400 });
+        }
+
+        await execute(
+            `INSERT INTO bot_heartbeat (id, report, received_at) VALUES (1, ?, datetime('now'))
+             ON CONFLICT(id) DO UPDATE SET report = excluded.report, received_at = excluded.received_at`,
+            [JSON.stringify(report)]
+        );
+
+        return NextResponse.json({ message: "Heartbeat recorded" });
+    } catch (error) {
+        console.error("Heartbeat error:", error);
+        return NextResponse.json({ detail: "Internal server error" }, { status: 500 });
+    }
+}
+
+// GET /api/health/heartbeat - Last bot health report and whether the bot is online
+export async function GET(request: NextRequest) {
+    try {
+        const authHeader = request.headers.get("authorization");
+        if (!authHeader || !validateToken(authHeader.replace("Bearer ", ""))) {
+            return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
+        }
+
+        const row = await fetchOne<{ report: string; received_at: string; age_seconds: number }>(
+            `SELECT report, received_at,
+                    CAST((julianday('now') - julianday(received_at)) * 86400 AS INTEGER) as age_seconds
+             FROM bot_heartbeat WHERE id = 1`
+        );
+
+        if (!row) {
+            return NextResponse.json({ online: false, received_at: null, age_seconds: null, report: null });
+        }
+
+        return NextResponse.json({
+            online: row.age_seconds <= STALE_AFTER_SECONDS,
+            received_at: row.received_at,
+            age_seconds: row.age_seconds,
+            report: JSON.parse(row.report)
+        });
+    } catch (error) {
+        console.error("Get heartbeat error:", error);
+        return NextResponse.json({ detail: "Internal server error" }, { status: 500 });
+    }
+}
@@ -7,6 +7,64 @@ async function runMigrations() {
         "ALTER TABLE events ADD COLUMN registration_fee TEXT",
         "ALTER TABLE events ADD COLUMN registration_link TEXT",
         "ALTER TABLE events ADD COLUMN results TEXT",
+        // Change tracking for /api/sync
+        "ALTER TABLE events ADD COLUMN updated_at TEXT",
+        "UPDATE events SET updated_at = COALESCE(created_at, datetime('now')) WHERE updated_at IS NULL",
+        "CREATE INDEX IF NOT EXISTS idx_events_updated ON events(updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_content_updated ON content_pages(updated_at)",
+        `CREATE TABLE IF NOT EXISTS event_tombstones (
+            event_id INTEGER PRIMARY KEY,
+            deleted_at TEXT DEFAULT (datetime('now'))
+        )`,
+        "CREATE INDEX IF NOT EXISTS idx_tombstones_deleted ON event_tombstones(deleted_at)",
+        // Keyset pagination on /api/events
+        "CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_time, id)",
+        // Broadcast checkpoints (last users.id delivered) so the bot can resume.
+        // Announcements from before the broadcaster were never marked sent; mark them now
+        // (only while delivery_cursor is still missing) so the bot doesn't resend them all.
+        `UPDATE announcements SET sent_at = COALESCE(sent_at, created_at, datetime('now'))
+         WHERE sent_at IS NULL
+           AND NOT EXISTS (SELECT 1 FROM pragma_table_info('announcements') WHERE name = 'delivery_cursor')`,
+        "ALTER TABLE announcements ADD COLUMN delivery_cursor INTEGER DEFAULT 0",
+        "ALTER TABLE announcements ADD COLUMN delivered_count INTEGER DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_announcements_pending ON announcements(sent_at)",
+        // Event names are the upsert key for scripts/seed_events.py (fails if duplicates exist)
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_events_name ON events(name)",
+        // Telemetry rollups read by /api/telemetry/stats (filled by scripts/rollup_telemetry.py)
+        `CREATE TABLE IF NOT EXISTS telemetry_hourly (
+            hour TEXT NOT NULL,
+            action TEXT NOT NULL,
+            event TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (hour, action, event)
+        )`,
+        `CREATE TABLE IF NOT EXISTS telemetry_daily (
+            day TEXT NOT NULL,
+            action TEXT NOT NULL,
+            event TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, action, event)
+        )`,
+        `CREATE TABLE IF NOT EXISTS telemetry_daily_users (
+            day TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            PRIMARY KEY (day, user_id)
+        ) WITHOUT ROWID`,
+        `CREATE TABLE IF NOT EXISTS telemetry_dau (
+            day TEXT PRIMARY KEY,
+            users INTEGER NOT NULL DEFAULT 0
+        )`,
+        `CREATE TABLE IF NOT EXISTS telemetry_rollup_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )`,
+        "CREATE INDEX IF NOT EXISTS idx_telemetry_daily_action ON telemetry_daily(action, day)",
+        // Bot health reports for the admin health page
+        `CREATE TABLE IF NOT EXISTS bot_heartbeat (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            report TEXT NOT NULL,
+            received_at TEXT DEFAULT (datetime('now'))
+        )`,
     ];
 
     const results: string[] = [];
@@ -0,0 +1,53 @@
+import { NextRequest, NextResponse } from "next/server";
+import { fetchAll, fetchOne } from "@/lib/db";
+
+const SYNC_OVERLAP_SECONDS = Number(process.env.SYNC_OVERLAP_SECONDS || 30);
+
+// GET /api/sync?since=<cursor> - Events and content changed since a cursor
+// Without `since` returns a full snapshot. Pass the returned `cursor` on the next call.
+// Deactivated events come back as rows with is_active = 0; hard-deleted ids are in `deleted`.
+export async function GET(request: NextRequest) {
+    try {
+        const { searchParams } = new URL(request.url);
+        const since = searchParams.get("since");
+
+        // Taken before reading so writes landing mid-request are picked up next time, and set
+        // back SYNC_OVERLAP_SECONDS so rows stamped just before a slow commit (seed scripts
+        // stamp at commit, but the commit itself takes a moment) still fall after the cursor.
+        // Rows in the overlap are returned again; clients apply them idempotently.
+        const now = await fetchOne<{ cursor: string }>(
+            "SELECT datetime('now', ?) as cursor",
+            [`-${SYNC_OVERLAP_SECONDS} seconds`]
+        );
+
+        if (!since) {
+            const events = await fetchAll("SELECT * FROM events ORDER BY start_time ASC");
+            const content = await fetchAll("SELECT key, content, updated_at FROM content_pages");
+            return NextResponse.json({ cursor: now?.cursor, full: true, events, deleted: [], content });
+        }
+
+        const events = await fetchAll(
+            "SELECT * FROM events WHERE updated_at >= ? ORDER BY start_time ASC",
+            [since]
+        );
+        const deleted = await fetchAll<{ event_id: number }>(
+            "SELECT event_id FROM event_tombstones WHERE deleted_at >= ?",
+            [since]
+        );
+        const content = await fetchAll(
+            "SELECT key, content, updated_at FROM content_pages WHERE updated_at >= ?",
+            [since]
+        );
+
+        return NextResponse.json({
+            cursor: now?.cursor,
+            full: false,
+            events,
+            deleted: deleted.map((row) => row.event_id),
+            content,
+        });
+    } catch (error) {
+        console.error("Sync error:", error);
+        return NextResponse.json({ detail: "Internal server error" }, { status: 500 });
+    }
+}
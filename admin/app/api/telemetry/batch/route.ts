@@ -0,0 +1,54 @@
+import { NextRequest, NextResponse } from "next/server";
+import { execute } from "@/lib/db";
+import { isBotRequest } from "@/lib/bot";
+import { InValue } from "@libsql/client";
+
+const MAX_BATCH = 500;
+
+interface TelemetryEvent {
+    telegram_id: number;
+    action: string;
+    metadata?: string | null;
+    created_at?: string;
+}
+
+// POST /api/telemetry/batch - Bulk log interactions buffered by the bot
+export async function POST(request: NextRequest) {
+    try {
+        if (!isBotRequest(request)) {
+            return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
+        }
+
+        const { events } = await request.json();
+
+        if (!Array.isArray(events) || events.length === 0) {
+            return NextResponse.json({ detail: "events array required" }, { status: 400 });
+        }
+        if (events.length > MAX_BATCH) {
+            return NextResponse.json({ detail: `At most ${MAX_BATCH} events per batch` }, { status: 400 });
+        }
+
+        const valid = (events as TelemetryEvent[]).filter((e) => e && e.telegram_id && e.action);
+        if (valid.length === 0) {
+            return NextResponse.json({ message: "Logged", count: 0 });
+        }
+
+        // One multi-row INSERT per batch instead of one round trip per event
+        const rows: string[] = [];
+        const params: InValue[] = [];
+        for (const e of valid) {
+            rows.push("((SELECT id FROM users WHERE telegram_id = ?), ?, ?, COALESCE(?, datetime('now')))");
+            params.push(e.telegram_id, e.action, e.metadata || "", e.created_at || null);
+        }
+
+        await execute(
+            `INSERT INTO telemetry (user_id, action, metadata, created_at) VALUES ${rows.join(", ")}`,
+            params
+        );
+
+        return NextResponse.json({ message: "Logged", count: valid.length });
+    } catch (error) {
+        console.error("Batch telemetry error:", error);
+        return NextResponse.json({ detail: "Internal server error" }, { status: 500 });
+    }
+}
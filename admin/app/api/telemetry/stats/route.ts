@@ -2,7 +2,13 @@ import { NextRequest, NextResponse } from "next/server";
 import { fetchOne, fetchAll } from "@/lib/db";
 import { validateToken } from "@/lib/auth";
 
+// Days covered by the activity, event and peak-hour breakdowns
+const RECENT_DAYS = 7;
+const DAU_DAYS = 14;
+
 // GET /api/telemetry/stats - Get analytics stats
+// Reads the rollup tables kept by scripts/rollup_telemetry.py, never the raw telemetry,
+// so the cost doesn't grow with the number of interactions logged.
 export async function GET(request: NextRequest) {
     try {
         const authHeader = request.headers.get("authorization");
@@ -10,37 +16,62 @@ export async function GET(request: NextRequest) {
             return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
         }
 
-        const totalUsers = await fetchOne<{ count: number }>(
-            "SELECT COUNT(*) as count FROM users"
-        );
-
-        const totalEvents = await fetchOne<{ count: number }>(
-            "SELECT COUNT(*) as count FROM events"
+        const stateRows = await fetchAll<{ key: string; value: number }>(
+            "SELECT key, value FROM telemetry_rollup_state"
         );
+        const state = Object.fromEntries(stateRows.map((row) => [row.key, Number(row.value)]));
 
-        const activeEvents = await fetchOne<{ count: number }>(
-            "SELECT COUNT(*) as count FROM events WHERE is_active = 1"
-        );
+        // Rollup buckets are in fest-local time; "today" must be too
+        const local = `${state.utc_offset_minutes || 0} minutes`;
+        const recentSince = `-${RECENT_DAYS - 1} days`;
 
-        const totalInteractions = await fetchOne<{ count: number }>(
-            "SELECT COUNT(*) as count FROM telemetry"
-        );
-
-        const recentInteractions = await fetchAll(
-            `SELECT action, COUNT(*) as count 
-             FROM telemetry 
-             WHERE created_at > datetime('now', '-7 days')
-             GROUP BY action 
-             ORDER BY count DESC
-             LIMIT 10`
-        );
+        const [events, recentActivity, topEvents, peakHours, dau] = await Promise.all([
+            fetchOne<{ total: number; active: number }>(
+                "SELECT COUNT(*) as total, COALESCE(SUM(is_active = 1), 0) as active FROM events"
+            ),
+            fetchAll<{ action: string; count: number }>(
+                `SELECT action, SUM(count) as count
+                 FROM telemetry_daily
+                 WHERE day >= date('now', ?, ?)
+                 GROUP BY action
+                 ORDER BY count DESC
+                 LIMIT 10`,
+                [local, recentSince]
+            ),
+            fetchAll<{ event: string; views: number }>(
+                `SELECT event, SUM(count) as views
+                 FROM telemetry_daily
+                 WHERE action = 'view_event' AND day >= date('now', ?, ?)
+                 GROUP BY event
+                 ORDER BY views DESC
+                 LIMIT 10`,
+                [local, recentSince]
+            ),
+            fetchAll<{ hour: string; count: number }>(
+                `SELECT substr(hour, 12, 2) as hour, SUM(count) as count
+                 FROM telemetry_hourly
+                 WHERE hour >= date('now', ?, ?)
+                 GROUP BY 1
+                 ORDER BY 1`,
+                [local, recentSince]
+            ),
+            fetchAll<{ day: string; users: number }>(
+                "SELECT day, users FROM telemetry_dau WHERE day >= date('now', ?, ?) ORDER BY day",
+                [local, `-${DAU_DAYS - 1} days`]
+            ),
+        ]);
 
         return NextResponse.json({
-            total_users: totalUsers?.count || 0,
-            events: totalEvents?.count || 0,
-            activeEvents: activeEvents?.count || 0,
-            interactions: totalInteractions?.count || 0,
-            recentActivity: recentInteractions
+            total_users: state.users || 0,
+            events: events?.total || 0,
+            activeEvents: events?.active || 0,
+            interactions: state.interactions || 0,
+            recentActivity,
+            topEvents,
+            peakHours,
+            dailyActiveUsers: dau,
+            // When the rollups were last brought up to date (null if the job never ran)
+            rolledUpAt: state.updated_at ? new Date(state.updated_at * 1000).toISOString() : null
         });
     } catch (error) {
         console.error("Get telemetry stats error:", error);
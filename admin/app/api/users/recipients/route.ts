@@ -0,0 +1,27 @@
+import { NextRequest, NextResponse } from "next/server";
+import { fetchAll } from "@/lib/db";
+import { isBotRequest } from "@/lib/bot";
+
+// GET /api/users/recipients?after=<users.id>&limit=N - Stream bot users in id order
+// Keyset paging, so each chunk is an index seek no matter how deep into the table.
+export async function GET(request: NextRequest) {
+    try {
+        if (!isBotRequest(request)) {
+            return NextResponse.json({ detail: "Unauthorized" }, { status: 401 });
+        }
+
+        const { searchParams } = new URL(request.url);
+        const after = parseInt(searchParams.get("after") || "0", 10) || 0;
+        const limit = Math.min(Math.max(parseInt(searchParams.get("limit") || "500", 10) || 500, 1), 5000);
+
+        const recipients = await fetchAll<{ id: number; telegram_id: number }>(
+            "SELECT id, telegram_id FROM users WHERE id > ? ORDER BY id ASC LIMIT ?",
+            [after, limit]
+        );
+
+        return NextResponse.json(recipients);
+    } catch (error) {
+        console.error("List recipients error:", error);
+        return NextResponse.json({ detail: "Internal server error" }, { status: 500 });
+    }
+}
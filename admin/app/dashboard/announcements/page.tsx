@@ -9,6 +9,7 @@ export default function AnnouncementsPage() {
     const [announcements, setAnnouncements] = useState<any[]>([]);
     const [title, setTitle] = useState("");
     const [message, setMessage] = useState("");
+    const [scheduledAt, setScheduledAt] = useState("");
     const [loading, setLoading] = useState(false);
     const [sending, setSending] = useState(false);
 
@@ -32,15 +33,19 @@ export default function AnnouncementsPage() {
         e.preventDefault();
         if (!title || !message) return;
 
-        if (!confirm("This will broadcast to ALL bot users. Continue?")) return;
+        const prompt = scheduledAt
+            ? "This will broadcast to ALL bot users at the scheduled time. Continue?"
+            : "This will broadcast to ALL bot users. Continue?";
+        if (!confirm(prompt)) return;
 
         setSending(true);
         try {
-            await api.post("/announcements/", { title, message });
+            await api.post("/announcements/", { title, message, scheduled_at: scheduledAt || null });
             setTitle("");
             setMessage("");
+            setScheduledAt("");
             fetchAnnouncements();
-            alert("Broadcast started!");
+            alert(scheduledAt ? "Broadcast scheduled!" : "Broadcast started!");
         } catch (err) {
             alert("Failed to send announcement");
         } finally {
@@ -88,13 +93,23 @@ export default function AnnouncementsPage() {
                                 />
                             </div>
 
+                            <div className="space-y-1">
+                                <label className="text-xs font-medium text-zinc-400">Send at (optional, fest time)</label>
+                                <input
+                                    type="datetime-local"
+                                    value={scheduledAt}
+                                    onChange={(e) => setScheduledAt(e.target.value)}
+                                    className="w-full glass-input px-4 py-2 rounded-lg text-white"
+                                />
+                            </div>
+
                             <button
                                 type="submit"
                                 disabled={sending}
                                 className="w-full bg-primary text-white py-2.5 rounded-xl font-medium hover:bg-primary/90 transition-colors flex items-center justify-center gap-2"
                             >
                                 {sending ? <Loader2 className="h-4 w-4 animate-spin" /> : <Send className="h-4 w-4" />}
-                                Broadcast Now
+                                {scheduledAt ? "Schedule Broadcast" : "Broadcast Now"}
                             </button>
 
                             <p className="text-xs text-zinc-500 text-center">
@@ -127,6 +142,9 @@ export default function AnnouncementsPage() {
                                         </div>
                                     </div>
                                     <p className="text-zinc-400 text-sm whitespace-pre-wrap">{item.message}</p>
+                                    {item.scheduled_at && !item.sent_at && (
+                                        <p className="text-xs text-amber-400 mt-2">Scheduled for {item.scheduled_at.replace("T", " ")}</p>
+                                    )}
                                 </motion.div>
                             ))}
                             {announcements.length === 0 && (
@@ -1,47 +1,107 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { CheckCircle, AlertTriangle, XCircle, RefreshCw, Server, Database } from "lucide-react";
+import { CheckCircle, AlertTriangle, XCircle, RefreshCw, Server, Database, Bot } from "lucide-react";
 import api from "@/lib/api";
 
+interface BotReport {
+    status: string;
+    api: string | null;
+    database: string | null;
+    latency_p50_ms: number | null;
+    latency_p95_ms: number | null;
+    error_rate: number | null;
+    window: number;
+    last_error: string | null;
+    checked_at: string | null;
+    uptime_seconds: number;
+    events: number;
+}
+
+interface Heartbeat {
+    online: boolean;
+    received_at: string | null;
+    age_seconds: number | null;
+    report: BotReport | null;
+}
+
+const formatAge = (seconds: number | null) => {
+    if (seconds === null) return "Never";
+    if (seconds < 60) return `${seconds}s ago`;
+    if (seconds < 3600) return `${Math.floor(seconds / 60)} min ago`;
+    return `${Math.floor(seconds / 3600)} h ago`;
+};
+
+const formatUptime = (seconds: number) => {
+    const hours = Math.floor(seconds / 3600);
+    const minutes = Math.floor((seconds % 3600) / 60);
+    return hours ? `${hours}h ${minutes}m` : `${minutes}m`;
+};
+
 export default function HealthPage() {
     const [health, setHealth] = useState<any>(null);
+    const [dbLatency, setDbLatency] = useState<number | null>(null);
+    const [heartbeat, setHeartbeat] = useState<Heartbeat | null>(null);
     const [loading, setLoading] = useState(true);
 
     const checkHealth = async () => {
         setLoading(true);
-        try {
-            const res = await api.get("/health/db");
-            setHealth(res.data);
-        } catch (err) {
-            setHealth({ status: "error" });
-        } finally {
-            setLoading(false);
+        const started = performance.now();
+        const [healthRes, heartbeatRes] = await Promise.allSettled([
+            api.get("/health"),
+            api.get("/health/heartbeat"),
+        ]);
+        if (healthRes.status === "fulfilled") {
+            setHealth(healthRes.value.data);
+            setDbLatency(Math.round(performance.now() - started));
+        } else {
+            setHealth({ status: "unhealthy", database: "error" });
+            setDbLatency(null);
         }
+        setHeartbeat(heartbeatRes.status === "fulfilled" ? heartbeatRes.value.data : null);
+        setLoading(false);
     };
 
     useEffect(() => {
         checkHealth();
+        // The bot reports every 30s; keep the page roughly in step
+        const timer = setInterval(checkHealth, 30000);
+        return () => clearInterval(timer);
     }, []);
 
     const getStatusColor = (status: string) => {
-        if (status === "healthy" || status === "connected") return "text-green-400";
-        if (status === "degraded") return "text-yellow-400";
+        if (status === "healthy" || status === "connected" || status === "online") return "text-green-400";
+        if (status === "degraded" || status === "starting") return "text-yellow-400";
         return "text-red-400";
     };
 
     const getStatusIcon = (status: string) => {
-        if (status === "healthy" || status === "connected") return CheckCircle;
-        if (status === "degraded") return AlertTriangle;
+        if (status === "healthy" || status === "connected" || status === "online") return CheckCircle;
+        if (status === "degraded" || status === "starting") return AlertTriangle;
         return XCircle;
     };
 
+    const StatusBadge = ({ status, label }: { status: string; label: string }) => {
+        const Icon = getStatusIcon(status);
+        return (
+            <div className={`flex items-center gap-2 ${getStatusColor(status)}`}>
+                <Icon className="h-5 w-5" />
+                <span className="text-sm font-medium">{label}</span>
+            </div>
+        );
+    };
+
+    const report = heartbeat?.report;
+    const botStatus = heartbeat?.online ? "online" : "offline";
+    const apiStatus = report && heartbeat?.online ? report.status : "unknown";
+    const dbStatus = health?.database || "error";
+
     return (
         <div className="space-y-8">
             <div className="flex items-center justify-between">
                 <div>
                     <h1 className="text-3xl font-bold text-white">System Health</h1>
-                    <p className="text-zinc-400 mt-2">Monitor database and API status.</p>
+                    <p className="text-zinc-400 mt-2">Monitor the bot, API and database.</p>
                 </div>
                 <button
                     onClick={checkHealth}
@@ -52,37 +112,69 @@ export default function HealthPage() {
                 </button>
             </div>
 
-            <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
-                {/* API Status */}
+            <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
+                {/* Bot Status */}
                 <div className="glass-card p-6 rounded-2xl border-zinc-800">
                     <div className="flex items-start justify-between mb-4">
                         <div className="flex items-center gap-3">
-                            <div className="p-3 bg-blue-500/10 rounded-xl text-blue-400">
-                                <Server className="h-6 w-6" />
+                            <div className="p-3 bg-green-500/10 rounded-xl text-green-400">
+                                <Bot className="h-6 w-6" />
                             </div>
                             <div>
-                                <h3 className="font-bold text-white">API Server</h3>
-                                <p className="text-xs text-zinc-500">FastAPI Backend</p>
+                                <h3 className="font-bold text-white">Telegram Bot</h3>
+                                <p className="text-xs text-zinc-500">Heartbeat</p>
                             </div>
                         </div>
-                        <div className={`flex items-center gap-2 ${getStatusColor("healthy")}`}>
-                            <CheckCircle className="h-5 w-5" />
-                            <span className="text-sm font-medium">Running</span>
-                        </div>
+                        <StatusBadge status={botStatus} label={heartbeat?.online ? "Online" : "Offline"} />
                     </div>
 
                     <div className="space-y-3">
+                        <div className="flex justify-between text-sm">
+                            <span className="text-zinc-400">Last Heartbeat</span>
+                            <span className="text-white">{formatAge(heartbeat?.age_seconds ?? null)}</span>
+                        </div>
                         <div className="flex justify-between text-sm">
                             <span className="text-zinc-400">Uptime</span>
-                            <span className="text-white">Active</span>
+                            <span className="text-white">{report ? formatUptime(report.uptime_seconds) : "-"}</span>
+                        </div>
+                        <div className="flex justify-between text-sm">
+                            <span className="text-zinc-400">Events Loaded</span>
+                            <span className="text-white">{report ? report.events : "-"}</span>
+                        </div>
+                    </div>
+                </div>
+
+                {/* API Status, as seen by the bot */}
+                <div className="glass-card p-6 rounded-2xl border-zinc-800">
+                    <div className="flex items-start justify-between mb-4">
+                        <div className="flex items-center gap-3">
+                            <div className="p-3 bg-blue-500/10 rounded-xl text-blue-400">
+                                <Server className="h-6 w-6" />
+                            </div>
+                            <div>
+                                <h3 className="font-bold text-white">API Server</h3>
+                                <p className="text-xs text-zinc-500">As seen by the bot</p>
+                            </div>
                         </div>
+                        <StatusBadge status={apiStatus} label={apiStatus.charAt(0).toUpperCase() + apiStatus.slice(1)} />
+                    </div>
+
+                    <div className="space-y-3">
                         <div className="flex justify-between text-sm">
-                            <span className="text-zinc-400">Environment</span>
-                            <span className="text-white">Production</span>
+                            <span className="text-zinc-400">Latency (p50 / p95)</span>
+                            <span className="text-white">
+                                {report?.latency_p50_ms != null
+                                    ? `${Math.round(report.latency_p50_ms)} / ${Math.round(report.latency_p95_ms ?? 0)} ms`
+                                    : "-"}
+                            </span>
                         </div>
                         <div className="flex justify-between text-sm">
-                            <span className="text-zinc-400">Docs</span>
-                            <a href="http://127.0.0.1:8000/docs" target="_blank" className="text-primary hover:underline">Swagger UI</a>
+                            <span className="text-zinc-400">Failed Checks</span>
+                            <span className={report?.error_rate ? "text-yellow-400" : "text-white"}>
+                                {report?.error_rate != null
+                                    ? `${Math.round(report.error_rate * 100)}% of last ${report.window}`
+                                    : "-"}
+                            </span>
                         </div>
                     </div>
                 </div>
@@ -99,38 +191,34 @@ export default function HealthPage() {
                                 <p className="text-xs text-zinc-500">Turso (libSQL)</p>
                             </div>
                         </div>
-
-                        {health ? (
-                            <div className={`flex items-center gap-2 ${getStatusColor("healthy")}`}>
-                                <CheckCircle className="h-5 w-5" />
-                                <span className="text-sm font-medium">Connected</span>
-                            </div>
-                        ) : (
-                            <div className="flex items-center gap-2 text-red-400">
-                                <XCircle className="h-5 w-5" />
-                                <span className="text-sm font-medium">Error</span>
-                            </div>
-                        )}
+                        <StatusBadge status={dbStatus} label={dbStatus === "connected" ? "Connected" : "Error"} />
                     </div>
 
-                    {health && (
-                        <div className="space-y-3">
-                            <div className="flex justify-between text-sm">
-                                <span className="text-zinc-400">Event Count</span>
-                                <span className="text-white">{health.events_count} events</span>
-                            </div>
-                            <div className="flex justify-between text-sm">
-                                <span className="text-zinc-400">Response Time</span>
-                                <span className="text-green-400">~45ms</span>
-                            </div>
-                            <div className="flex justify-between text-sm">
-                                <span className="text-zinc-400">Provider</span>
-                                <span className="text-white">Turso Edge</span>
-                            </div>
+                    <div className="space-y-3">
+                        <div className="flex justify-between text-sm">
+                            <span className="text-zinc-400">Response Time</span>
+                            <span className="text-white">{dbLatency !== null ? `${dbLatency} ms` : "-"}</span>
                         </div>
-                    )}
+                        <div className="flex justify-between text-sm">
+                            <span className="text-zinc-400">Provider</span>
+                            <span className="text-white">Turso Edge</span>
+                        </div>
+                    </div>
                 </div>
             </div>
+
+            {/* Latest error reported by the bot */}
+            {report?.last_error && (
+                <div className="glass-card p-6 rounded-2xl border-zinc-800">
+                    <h3 className="font-bold text-white mb-2">Last Error</h3>
+                    <p className="text-sm text-red-400 font-mono">{report.last_error}</p>
+                    {report.checked_at && (
+                        <p className="text-xs text-zinc-500 mt-2">
+                            Last check: {new Date(report.checked_at).toLocaleString()}
+                        </p>
+                    )}
+                </div>
+            )}
         </div>
     );
 }
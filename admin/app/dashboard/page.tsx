@@ -43,7 +43,12 @@ export default function DashboardPage() {
         <div className="space-y-8">
             <div>
                 <h1 className="text-3xl font-bold text-white">Dashboard Overview</h1>
-                <p className="text-zinc-400 mt-2">Real-time insights from Brahma 26.</p>
+                <p className="text-zinc-400 mt-2">
+                    Insights from Brahma 26.{" "}
+                    {stats.rolledUpAt
+                        ? `Activity as of ${new Date(stats.rolledUpAt).toLocaleString()}.`
+                        : "Activity appears once scripts/rollup_telemetry.py has run."}
+                </p>
             </div>
 
             {/* Stats Cards - Simplified, no heavy animations */}
@@ -122,6 +127,82 @@ export default function DashboardPage() {
                 </div>
 
             </div>
+
+            <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
+
+                {/* Daily Active Users */}
+                <div className="glass-card p-6 rounded-2xl border border-zinc-800">
+                    <h3 className="text-lg font-bold text-white mb-6">Daily Active Users</h3>
+                    <div className="h-[240px] w-full">
+                        {stats.dailyActiveUsers && stats.dailyActiveUsers.length > 0 ? (
+                            <ResponsiveContainer width="100%" height="100%">
+                                <BarChart data={stats.dailyActiveUsers}>
+                                    <XAxis dataKey="day" stroke="#52525b" fontSize={12} tickLine={false} axisLine={false}
+                                        tickFormatter={(day: string) => day.slice(5)} />
+                                    <YAxis stroke="#52525b" fontSize={12} tickLine={false} axisLine={false} />
+                                    <Tooltip
+                                        contentStyle={{ backgroundColor: "#18181b", border: "1px solid #27272a", borderRadius: "8px" }}
+                                        itemStyle={{ color: "#fff" }}
+                                    />
+                                    <Bar dataKey="users" fill="#3b82f6" radius={[4, 4, 0, 0]} />
+                                </BarChart>
+                            </ResponsiveContainer>
+                        ) : (
+                            <div className="h-full flex items-center justify-center text-zinc-500">
+                                No activity data yet
+                            </div>
+                        )}
+                    </div>
+                </div>
+
+                {/* Peak Hours */}
+                <div className="glass-card p-6 rounded-2xl border border-zinc-800">
+                    <h3 className="text-lg font-bold text-white mb-6">Peak Hours (Last 7 Days)</h3>
+                    <div className="h-[240px] w-full">
+                        {stats.peakHours && stats.peakHours.length > 0 ? (
+                            <ResponsiveContainer width="100%" height="100%">
+                                <BarChart data={stats.peakHours}>
+                                    <XAxis dataKey="hour" stroke="#52525b" fontSize={12} tickLine={false} axisLine={false} />
+                                    <YAxis stroke="#52525b" fontSize={12} tickLine={false} axisLine={false} />
+                                    <Tooltip
+                                        contentStyle={{ backgroundColor: "#18181b", border: "1px solid #27272a", borderRadius: "8px" }}
+                                        itemStyle={{ color: "#fff" }}
+                                    />
+                                    <Bar dataKey="count" radius={[4, 4, 0, 0]}>
+                                        {stats.peakHours.map((_: any, i: number) => (
+                                            <Cell key={i} fill={CHART_COLORS[i % CHART_COLORS.length]} />
+                                        ))}
+                                    </Bar>
+                                </BarChart>
+                            </ResponsiveContainer>
+                        ) : (
+                            <div className="h-full flex items-center justify-center text-zinc-500">
+                                No activity data yet
+                            </div>
+                        )}
+                    </div>
+                </div>
+
+                {/* Event Popularity */}
+                <div className="glass-card p-6 rounded-2xl border border-zinc-800">
+                    <h3 className="text-lg font-bold text-white mb-6">Most Viewed Events</h3>
+                    <div className="space-y-4">
+                        {stats.topEvents && stats.topEvents.length > 0 ? (
+                            stats.topEvents.slice(0, 5).map((item: any, i: number) => (
+                                <div key={i} className="flex items-center justify-between p-3 bg-zinc-900/50 rounded-lg">
+                                    <span className="text-zinc-300">{item.event || "Unknown"}</span>
+                                    <span className="text-zinc-400">{item.views} views</span>
+                                </div>
+                            ))
+                        ) : (
+                            <div className="text-zinc-500 text-center py-8">
+                                No event views yet
+                            </div>
+                        )}
+                    </div>
+                </div>
+
+            </div>
         </div>
     );
 }
@@ -0,0 +1,39 @@
+import { timingSafeEqual } from "crypto";
+
+// Notify the Telegram bot that cached data changed, so admin edits show up instantly.
+// Requires BOT_NOTIFY_URL (the bot's health server) and BOT_SHARED_SECRET.
+export type BotScope = "events" | "content" | "announcements";
+
+export async function notifyBot(scope: BotScope): Promise<void> {
+    const url = process.env.BOT_NOTIFY_URL;
+    const secret = process.env.BOT_SHARED_SECRET;
+    if (!url || !secret) return;
+
+    try {
+        const res = await fetch(`${url.replace(/\/$/, "")}/invalidate`, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "X-Bot-Secret": secret,
+            },
+            body: JSON.stringify({ scope }),
+            signal: AbortSignal.timeout(2000),
+        });
+        if (!res.ok) {
+            console.error(`Bot notify failed (${scope}): ${res.status}`);
+        }
+    } catch (error) {
+        // Never fail the admin write because the bot is asleep; its TTLs still apply
+        console.error(`Bot notify error (${scope}):`, error);
+    }
+}
+
+// Check the X-Bot-Secret header on bot -> API calls. Closed if no secret is configured:
+// these routes expose the user list and control broadcasts.
+export function isBotRequest(request: Request): boolean {
+    const secret = process.env.BOT_SHARED_SECRET;
+    if (!secret) return false;
+    const provided = Buffer.from(request.headers.get("x-bot-secret") || "");
+    const expected = Buffer.from(secret);
+    return provided.length === expected.length && timingSafeEqual(provided, expected);
+}
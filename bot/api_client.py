@@ -3,68 +3,234 @@ API Client for Brahma 26 Bot
 Fetches data from the Vercel-hosted Next.js API.
 """
 import os
-import requests
-from typing import Optional, List, Dict
+import json
+import logging
+import httpx
+from typing import Any, Optional, List, Dict
+
+import metrics
+from breaker import BreakerTransport, CircuitBreaker, CircuitOpenError, CLOSED
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 # Base URL for the API (Vercel deployment will set this)
 API_BASE = os.getenv("API_BASE_URL", "http://127.0.0.1:3000")
 
-def get_events(category: Optional[str] = None, active_only: bool = True) -> List[Dict]:
+# Seconds each resource stays cached. Event data changes a few times a day.
+CACHE_TTLS = {
+    "events": 60,
+    "event": 120,
+    "categories": 600,
+    "content": 300
+}
+
+if os.getenv("BOT_SHARED_SECRET"):
+    # The admin API pushes invalidations on every write (see /invalidate in main.py),
+    # so TTLs only bound staleness if a notification gets lost.
+    CACHE_TTLS = {
+        "events": 1800,
+        "event": 1800,
+        "categories": 3600,
+        "content": 3600
+    }
+
+_cache = TTLCache(maxsize=int(os.getenv("API_CACHE_SIZE", 256)))
+
+# Per-resource data version, bumped whenever a refetch returns different data.
+# Lets callers (e.g. the render cache) reuse work until the data really changes.
+_versions: Dict[str, int] = {}
+_digests: Dict[tuple, int] = {}
+
+# Fails API calls fast after repeated errors, so handlers fall back to cached data
+# right away instead of each waiting out a timeout while the API is down.
+breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("API_BREAKER_FAILURES", 5)),
+    reset_timeout=float(os.getenv("API_BREAKER_RESET", 15))
+)
+
+# One pooled client shared by every handler. Connections are kept alive
+# between calls, so a button press doesn't pay for a fresh TLS handshake.
+_client: Optional[httpx.AsyncClient] = None
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=API_BASE,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            # Times every call and counts it by route and status for /metrics
+            transport=BreakerTransport(metrics.InstrumentedTransport(limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0
+            )), breaker)
+        )
+    return _client
+
+async def close_client():
+    """Close the shared HTTP client (called on bot shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def has_bot_secret() -> bool:
+    """Bot-only API routes (broadcasts, telemetry, registrations, heartbeats) reject
+    calls unless BOT_SHARED_SECRET is set on both sides."""
+    return bool(os.getenv("BOT_SHARED_SECRET"))
+
+def bot_headers() -> Dict[str, str]:
+    """Headers for bot-only API routes (checked against BOT_SHARED_SECRET)."""
+    return {"X-Bot-Secret": os.getenv("BOT_SHARED_SECRET", "")}
+
+def invalidate_cache(*resources: str) -> int:
+    """Expire cached responses for the given resources ("events", "event", "categories",
+    "content"), or everything if none are given. Returns the number of entries expired.
+    Expired entries are still served if the API is down."""
+    return _cache.invalidate(*resources)
+
+def cache_stats() -> Dict[str, int]:
+    """Cache hit/miss counters."""
+    return _cache.stats()
+
+def degraded() -> bool:
+    """True while the API circuit is not closed, i.e. data shown may be out of date."""
+    return breaker.state != CLOSED
+
+def _fallback(resource: str, error: Exception):
+    """Record a failed read that is about to be answered with an empty default."""
+    metrics.API_FALLBACKS.inc(resource)
+    if isinstance(error, CircuitOpenError):
+        # Already logged once when the circuit opened
+        return
+    logger.warning(f"⚠️ API {resource} unavailable: {type(error).__name__}: {error}")
+
+def data_version(resource: str) -> int:
+    """Current version of a resource's data ("events", "event", "content", ...)."""
+    return _versions.get(resource, 0)
+
+def _note_version(key: tuple, data: Any):
+    digest = hash(json.dumps(data, sort_keys=True))
+    if _digests.get(key) != digest:
+        _digests[key] = digest
+        _versions[key[0]] = _versions.get(key[0], 0) + 1
+
+async def _get_json(path: str, params: Optional[Dict] = None, timeout: float = 10) -> Any:
+    """GET a JSON resource. Returns None on 404, raises on other errors."""
+    r = await get_client().get(path, params=params, headers=bot_headers(), timeout=timeout)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return r.json()
+
+async def _cached(key: tuple, path: str, params: Optional[Dict] = None) -> Any:
+    """Fetch through the cache. Errors are not cached; if the fetch fails the last
+    known good value is returned (even if expired), and the error raised only without one."""
+    async def load():
+        data = await _get_json(path, params)
+        _note_version(key, data)
+        return data
+
+    try:
+        return await _cache.get_or_fetch(key, load, CACHE_TTLS[key[0]])
+    except Exception:
+        found, value = _cache.peek(key)
+        if not found:
+            raise
+        return value
+
+async def get_events(category: Optional[str] = None, active_only: bool = True) -> List[Dict]:
     """Get list of events from API."""
     params = {"active_only": str(active_only).lower()}
     if category:
         params["category"] = category
-    
+
     try:
-        r = requests.get(f"{API_BASE}/api/events", params=params, timeout=10)
-        return r.json() if r.status_code == 200 else []
-    except Exception:
+        return await _cached(("events", category, active_only), "/api/events", params) or []
+    except Exception as e:
+        _fallback("events", e)
         return []
 
-def get_event(event_id: int) -> Optional[Dict]:
+async def fetch_all_events() -> List[Dict]:
+    """Fetch every event, active or not, bypassing the cache. Raises on errors."""
+    return await _get_json("/api/events", {"active_only": "false"}) or []
+
+async def fetch_changes(since: Optional[str] = None) -> Optional[Dict]:
+    """Fetch events and content changed since a sync cursor (full snapshot if None).
+    Returns None if the API has no /api/sync endpoint. Raises on other errors."""
+    params = {"since": since} if since else None
+    return await _get_json("/api/sync", params)
+
+def prime_content(rows: List[Dict]):
+    """Put content pages from a sync response straight into the cache."""
+    for row in rows:
+        key = ("content", row["key"])
+        data = {"key": row["key"], "content": row["content"]}
+        _note_version(key, data)
+        _cache.set(key, data, CACHE_TTLS["content"])
+
+async def get_event(event_id: int) -> Optional[Dict]:
     """Get single event by ID."""
     try:
-        r = requests.get(f"{API_BASE}/api/events/{event_id}", timeout=10)
-        return r.json() if r.status_code == 200 else None
-    except Exception:
+        return await _cached(("event", event_id), f"/api/events/{event_id}")
+    except Exception as e:
+        _fallback("event", e)
         return None
 
-def get_categories() -> List[str]:
+async def get_categories() -> List[str]:
     """Get list of event categories."""
     try:
-        r = requests.get(f"{API_BASE}/api/events/categories", timeout=10)
-        return r.json() if r.status_code == 200 else []
-    except Exception:
+        return await _cached(("categories",), "/api/events/categories") or []
+    except Exception as e:
+        _fallback("categories", e)
         return []
 
-def get_content(key: str) -> Optional[str]:
+async def get_content(key: str) -> Optional[str]:
     """Get content by key (faq, emergency_contacts, about)."""
     try:
-        r = requests.get(f"{API_BASE}/api/content?key={key}", timeout=10)
-        if r.status_code == 200:
-            return r.json().get("content")
-        return None
-    except Exception:
+        data = await _cached(("content", key), "/api/content", {"key": key})
+        return data.get("content") if data else None
+    except Exception as e:
+        _fallback("content", e)
         return None
 
-def log_interaction(telegram_id: int, action: str, metadata: Optional[str] = None):
-    """Log user interaction via telemetry API."""
+async def get_health() -> Optional[Dict]:
+    """Get API health report. Empty dict on error status, None if unreachable."""
     try:
-        requests.post(f"{API_BASE}/api/telemetry/log", json={
-            "telegram_id": telegram_id,
-            "action": action,
-            "metadata": metadata
-        }, timeout=1) 
-    except Exception:
-        pass # Fire and forget
+        r = await get_client().get("/api/health", timeout=5)
+        return r.json() if r.status_code == 200 else {}
+    except Exception as e:
+        _fallback("health", e)
+        return None
 
-def register_user(telegram_id: int, username: Optional[str] = None):
-    """Register a bot user."""
-    try:
-        requests.post(f"{API_BASE}/api/auth/register-bot-user", json={
-            "telegram_id": telegram_id,
-            "username": username
-        }, timeout=5)
-    except Exception:
-        pass
+async def send_heartbeat(snapshot: Dict):
+    """Report the bot's health snapshot to the admin API. Raises on errors."""
+    r = await get_client().post("/api/health/heartbeat", json=snapshot, headers=bot_headers(), timeout=5)
+    r.raise_for_status()
+
+async def get_pending_announcements() -> List[Dict]:
+    """Announcements not yet fully delivered, oldest first. Raises on errors."""
+    return await _get_json("/api/announcements", {"pending": "true"}) or []
+
+async def get_recipients(after: int = 0, limit: int = 500) -> List[Dict]:
+    """Next chunk of bot users ({id, telegram_id}) with users.id > after. Raises on errors."""
+    return await _get_json("/api/users/recipients", {"after": after, "limit": limit}) or []
+
+async def checkpoint_announcement(announcement_id: int, cursor: int, delivered: int, sent: bool = False):
+    """Save broadcast progress so a restart resumes after `cursor`. Raises on errors."""
+    r = await get_client().patch("/api/announcements", json={
+        "id": announcement_id,
+        "delivery_cursor": cursor,
+        "delivered_count": delivered,
+        "sent": sent
+    }, headers=bot_headers(), timeout=10)
+    r.raise_for_status()
 
+async def register_users(users: List[Dict]):
+    """Register bot users and bump last_active in one call
+    ({telegram_id, username, seen_at} each). Raises on errors."""
+    r = await get_client().post("/api/auth/register-bot-users", json={"users": users},
+                                headers=bot_headers(), timeout=10)
+    r.raise_for_status()
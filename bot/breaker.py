@@ -0,0 +1,102 @@
+"""
+Circuit breaker for Brahma 26 Bot
+Stops calling the admin API for a while after repeated failures, so handlers fail
+fast (and fall back to cached data) instead of each waiting out a timeout.
+"""
+import time
+import logging
+from typing import Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling the API while the circuit is open."""
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures. After `reset_timeout`
+    seconds one trial call is let through (half-open): success closes the circuit,
+    failure opens it again for another `reset_timeout`."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 15.0,
+                 on_close: Optional[Callable[[], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_close = on_close
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. In half-open only one trial runs at a time."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """End a call without a verdict (e.g. it was cancelled)."""
+        self._trial_running = False
+
+    def record_success(self):
+        self._trial_running = False
+        self.failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            logger.info("✅ API circuit closed, upstream recovered")
+            if self.on_close:
+                self.on_close()
+
+    def record_failure(self):
+        self._trial_running = False
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            if self.state == CLOSED:
+                logger.warning(f"⚡ API circuit open after {self.failures} failures, serving cached data")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.opened += 1
+
+    def stats(self):
+        return {"state": self.state, "failures": self.failures, "opened": self.opened, "rejected": self.rejected}
+
+class BreakerTransport(httpx.AsyncBaseTransport):
+    """Wraps another transport; errors and 5xx responses count as failures."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        self.transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            raise CircuitOpenError("API circuit open", request=request)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancellation says nothing about the API, but frees the half-open trial
+            self.breaker.release()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,414 @@
+"""
+Announcement broadcasts for Brahma 26 Bot
+Fans announcements out to every registered user within Telegram's rate limits.
+"""
+import os
+import html
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from telegram import Bot
+from telegram.ext import CallbackContext, JobQueue
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from api_client import checkpoint_announcement, get_pending_announcements, get_recipients
+from event_store import FEST_TZ
+from quantiles import quantiles
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a token."""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def refund(self):
+        """Return an unused token."""
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+    def pause(self, seconds: float):
+        """Hand out nothing for `seconds` (Telegram asked us to back off) and drain the burst."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+EMERGENCY = "emergency"
+NORMAL = "normal"
+LANES = (EMERGENCY, NORMAL)
+
+def lane_for(announcement: Dict) -> str:
+    """Delivery lane for an announcement's priority."""
+    return EMERGENCY if (announcement.get("priority") or "").lower() == EMERGENCY else NORMAL
+
+class DeliveryScheduler:
+    """Telegram's limits (about 30 messages/s overall, 1 message/s per chat) shared by two lanes.
+
+    The normal lane is capped at `normal_share` of the global rate, so the emergency lane
+    always has headroom. While any emergency broadcast is running, normal sends stop at a
+    gate, including those already in flight, and the emergency lane gets the whole budget.
+    """
+
+    def __init__(self, global_rate: float = 30, normal_share: float = 0.8, per_chat_interval: float = 1.0):
+        self.bucket = TokenBucket(global_rate)
+        self.normal_bucket = TokenBucket(global_rate * normal_share)
+        self.per_chat_interval = per_chat_interval
+        self._next_per_chat: Dict[int, float] = {}
+        self._emergencies = 0
+        self._normal_gate = asyncio.Event()
+        self._normal_gate.set()
+
+    def begin_emergency(self):
+        self._emergencies += 1
+        self._normal_gate.clear()
+
+    def end_emergency(self):
+        self._emergencies -= 1
+        if not self._emergencies:
+            self._normal_gate.set()
+
+    async def _per_chat(self, chat_id: int):
+        now = time.monotonic()
+        ready_at = self._next_per_chat.get(chat_id, 0.0)
+        self._next_per_chat[chat_id] = max(now, ready_at) + self.per_chat_interval
+        if ready_at > now:
+            await asyncio.sleep(ready_at - now)
+
+        if len(self._next_per_chat) > 10000:
+            # Forget chats whose slot has passed
+            now = time.monotonic()
+            self._next_per_chat = {c: t for c, t in self._next_per_chat.items() if t > now}
+
+    async def wait(self, chat_id: int, lane: str = NORMAL):
+        """Wait until a message in `lane` may be sent to chat_id."""
+        await self._per_chat(chat_id)
+        if lane == EMERGENCY:
+            await self.bucket.acquire()
+            return
+
+        while True:
+            await self._normal_gate.wait()
+            await self.normal_bucket.acquire()
+            await self.bucket.acquire()
+            if self._normal_gate.is_set():
+                return
+            # An emergency started while we waited: hand the slot over
+            self.bucket.refund()
+
+    def back_off(self, retry_after):
+        """Apply a RetryAfter from Telegram to everyone."""
+        if isinstance(retry_after, timedelta):
+            retry_after = retry_after.total_seconds()
+        self.bucket.pause(float(retry_after))
+
+def format_announcement(announcement: Dict) -> str:
+    """Announcement text as Telegram HTML (admin input is escaped)."""
+    title = html.escape(announcement.get("title") or "Announcement")
+    message = html.escape(announcement.get("message") or "")
+    return f"📢 <b>{title}</b>\n\n{message}"
+
+def _due_at(announcement: Dict) -> float:
+    """Unix time the announcement became due: its scheduled time if it had one, else
+    when it was created. Delivery latency is measured from here."""
+    return max(_created_at(announcement), _scheduled_for(announcement) or 0.0)
+
+def _created_at(announcement: Dict) -> float:
+    """Unix time the announcement was created (SQLite datetime('now') is UTC)."""
+    try:
+        created = datetime.strptime(announcement.get("created_at") or "", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return time.time()
+    return created.replace(tzinfo=timezone.utc).timestamp()
+
+def _scheduled_for(announcement: Dict) -> Optional[float]:
+    """Unix time an announcement is scheduled for, None to send now.
+    scheduled_at is fest-local time like event times."""
+    scheduled = announcement.get("scheduled_at")
+    if not scheduled:
+        return None
+    try:
+        when = datetime.fromisoformat(scheduled.replace(" ", "T"))
+    except ValueError:
+        logger.warning(f"Announcement {announcement['id']} has an unreadable scheduled_at {scheduled!r}; sending now")
+        return None
+    return when.replace(tzinfo=FEST_TZ).timestamp()
+
+class Broadcaster:
+    """Delivers pending announcements to all users, checkpointing after each chunk.
+
+    Recipients are streamed from the API in users.id order. After every chunk the last
+    id delivered is saved on the announcement, so after a restart a broadcast resumes
+    there. At most one chunk may be sent twice.
+
+    Each lane has its own worker, so an emergency starts as soon as it is created even
+    while a long normal broadcast is running; the scheduler then pauses the normal one.
+
+    Announcements scheduled for later get a one-off JobQueue job that fires at
+    scheduled_at. The timers are rebuilt from the unsent rows at startup and re-synced
+    whenever the admin panel reports a change.
+    """
+
+    def __init__(self, bot: Bot, scheduler: DeliveryScheduler, chunk_size: int = 200,
+                 max_attempts: int = 5, check_interval: float = 300, latency_samples: int = 2000,
+                 job_queue: Optional[JobQueue] = None):
+        self.bot = bot
+        self.job_queue = job_queue
+        self.scheduler = scheduler
+        self.chunk_size = chunk_size
+        self.max_attempts = max_attempts
+        self.check_interval = check_interval
+        self._running: set = set()
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._current: Dict[str, Optional[int]] = {lane: None for lane in LANES}
+        # Announcement id -> (scheduled_at, cancel timer, announcement)
+        self._timers: Dict[int, Tuple[str, Callable[[], None], Dict]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        # Seconds from when an announcement was due (created or scheduled) to delivery, per lane
+        # (most recent deliveries; kept small because stats() sorts it on the event loop)
+        self._latency: Dict[str, deque] = {lane: deque(maxlen=latency_samples) for lane in LANES}
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.last_report: Dict[str, Dict] = {}
+
+    async def deliver(self, chat_id: int, text: str, lane: str = NORMAL) -> bool:
+        """Send one message, retrying on flood control and network errors."""
+        for attempt in range(self.max_attempts):
+            await self.scheduler.wait(chat_id, lane)
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text, parse_mode="HTML")
+                return True
+            except RetryAfter as e:
+                self.retried += 1
+                self.scheduler.back_off(e.retry_after)
+            except Forbidden:
+                return False  # User blocked the bot or deleted their account
+            except BadRequest as e:
+                logger.warning(f"Broadcast to {chat_id} rejected: {e}")
+                return False
+            except NetworkError:
+                self.retried += 1
+                await asyncio.sleep(min(2 ** attempt, 30))
+        return False
+
+    async def _deliver_timed(self, chat_id: int, text: str, lane: str, due: float) -> bool:
+        ok = await self.deliver(chat_id, text, lane)
+        if ok:
+            self._latency[lane].append(time.time() - due)
+        return ok
+
+    async def broadcast(self, announcement: Dict, lane: str = NORMAL):
+        """Deliver one announcement to every user, resuming from its checkpoint."""
+        announcement_id = announcement["id"]
+        cursor = announcement.get("delivery_cursor") or 0
+        delivered = announcement.get("delivered_count") or 0
+        text = format_announcement(announcement)
+        due = _due_at(announcement)
+        started = time.monotonic()
+        sent_now = failed_now = 0
+
+        logger.info(f"📢 Broadcasting {lane} announcement {announcement_id} (resuming after user {cursor})")
+        while True:
+            recipients = await get_recipients(after=cursor, limit=self.chunk_size)
+            if not recipients:
+                break
+
+            results = await asyncio.gather(*(
+                self._deliver_timed(r["telegram_id"], text, lane, due) for r in recipients
+            ))
+            ok = sum(results)
+            delivered += ok
+            sent_now += ok
+            failed_now += len(results) - ok
+            self.delivered += ok
+            self.failed += len(results) - ok
+
+            cursor = recipients[-1]["id"]
+            await checkpoint_announcement(announcement_id, cursor, delivered)
+
+        await checkpoint_announcement(announcement_id, cursor, delivered, sent=True)
+
+        elapsed = time.monotonic() - started
+        rate = (sent_now + failed_now) / elapsed if elapsed > 0 else 0.0
+        self.last_report[lane] = {
+            "announcement_id": announcement_id,
+            "delivered": delivered,
+            "failed": failed_now,
+            "seconds": round(elapsed, 1),
+            # Time from when it was due until the last user had it
+            "reached_all_after_seconds": round(time.time() - due, 1),
+            "messages_per_second": round(rate, 1),
+            # What this throughput means for a full fest audience
+            "projected_seconds_for_20k": round(20000 / rate) if rate else None
+        }
+        logger.info(f"✅ Broadcast {announcement_id} done: {self.last_report[lane]}")
+
+    async def check_pending(self):
+        """Queue due announcements and (re)arm timers for scheduled ones."""
+        try:
+            pending = await get_pending_announcements()
+        except Exception as e:
+            logger.warning(f"Could not load pending announcements: {e}")
+            return
+
+        pending_ids = set()
+        for announcement in pending:
+            pending_ids.add(announcement["id"])
+            if announcement["id"] in self._running:
+                continue
+            when = _scheduled_for(announcement)
+            if when is None or when <= time.time():
+                self._cancel_timer(announcement["id"])
+                self._enqueue(announcement)
+            else:
+                self._arm(announcement, when)
+
+        # Deleted (or sent elsewhere) since the timer was set
+        for announcement_id in list(self._timers):
+            if announcement_id not in pending_ids:
+                self._cancel_timer(announcement_id)
+
+    def _enqueue(self, announcement: Dict):
+        self._running.add(announcement["id"])
+        self._queues[lane_for(announcement)].put_nowait(announcement)
+
+    def _arm(self, announcement: Dict, when: float):
+        announcement_id = announcement["id"]
+        timer = self._timers.get(announcement_id)
+        if timer is not None and timer[0] == announcement["scheduled_at"]:
+            return
+        self._cancel_timer(announcement_id)
+
+        if self.job_queue is not None:
+            job = self.job_queue.run_once(
+                self._fire_job, datetime.fromtimestamp(when, tz=timezone.utc),
+                data=announcement_id, name=f"announcement-{announcement_id}"
+            )
+            cancel = job.schedule_removal
+        else:
+            # No JobQueue (APScheduler not installed): a plain event loop timer does the same
+            handle = asyncio.get_running_loop().call_later(when - time.time(), self._fire, announcement_id)
+            cancel = handle.cancel
+        self._timers[announcement_id] = (announcement["scheduled_at"], cancel, announcement)
+        logger.info(f"⏰ Announcement {announcement_id} scheduled for {announcement['scheduled_at']}")
+
+    def _cancel_timer(self, announcement_id: int):
+        timer = self._timers.pop(announcement_id, None)
+        if timer is not None:
+            timer[1]()
+
+    async def _fire_job(self, context: CallbackContext):
+        self._fire(context.job.data)
+
+    def _fire(self, announcement_id: int):
+        timer = self._timers.pop(announcement_id, None)
+        if timer is not None and announcement_id not in self._running:
+            self._enqueue(timer[2])
+
+    async def _lane_worker(self, lane: str):
+        queue = self._queues[lane]
+        while True:
+            announcement = await queue.get()
+            self._current[lane] = announcement["id"]
+            if lane == EMERGENCY:
+                self.scheduler.begin_emergency()
+            try:
+                await self.broadcast(announcement, lane)
+            except Exception as e:
+                # Checkpoint is saved; the next check resumes from there
+                logger.error(f"Broadcast {announcement['id']} interrupted: {e}")
+            finally:
+                if lane == EMERGENCY:
+                    self.scheduler.end_emergency()
+                self._current[lane] = None
+                self._running.discard(announcement["id"])
+
+    def request_check(self):
+        """Look for new announcements now (e.g. one was just created)."""
+        if self._wakeup:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the polling loop and one worker per lane (call from the running event loop)."""
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._queues = {lane: asyncio.Queue() for lane in LANES}
+            self._tasks = [asyncio.create_task(self._run())]
+            self._tasks += [asyncio.create_task(self._lane_worker(lane)) for lane in LANES]
+
+    async def stop(self):
+        """Stop broadcasting; progress up to the last chunk is already saved."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for announcement_id in list(self._timers):
+            self._cancel_timer(announcement_id)
+        self._running.clear()
+
+    async def _run(self):
+        while True:
+            await self.check_pending()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self) -> Dict:
+        """Delivery counters, per-lane latency and each lane's last throughput report."""
+        latency = {lane: quantiles(self._latency[lane], (0.50, 0.99)) for lane in LANES}
+        return {
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retried": self.retried,
+            "scheduled": {i: timer[0] for i, timer in sorted(self._timers.items())},
+            "lanes": {
+                lane: {
+                    "running": self._current[lane],
+                    "queued": self._queues[lane].qsize() if lane in self._queues else 0,
+                    "latency_p50": latency[lane][0.50],
+                    "latency_p99": latency[lane][0.99],
+                    "last_broadcast": self.last_report.get(lane, {})
+                }
+                for lane in LANES
+            }
+        }
+
+def create_broadcaster(bot: Bot, job_queue: Optional[JobQueue] = None) -> Broadcaster:
+    """Broadcaster configured from the environment."""
+    return Broadcaster(
+        bot,
+        DeliveryScheduler(
+            global_rate=float(os.getenv("BROADCAST_RATE", 25)),
+            normal_share=float(os.getenv("BROADCAST_NORMAL_SHARE", 0.8))
+        ),
+        chunk_size=int(os.getenv("BROADCAST_CHUNK_SIZE", 200)),
+        check_interval=float(os.getenv("ANNOUNCEMENT_CHECK_INTERVAL", 300)),
+        job_queue=job_queue
+    )
@@ -0,0 +1,100 @@
+"""
+In-process TTL cache for Brahma 26 Bot
+Bounded LRU with per-entry expiry, request coalescing and last-known-good values.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class TTLCache:
+    """LRU cache whose entries expire after a per-call TTL.
+
+    Keys are tuples whose first item names the resource (e.g. ("events", None, True)),
+    so a whole resource can be invalidated at once. Concurrent misses on the same key
+    share a single loader call. Expired and invalidated entries are kept (until evicted)
+    so peek() can still return them when the source is down.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    async def get_or_fetch(self, key: Tuple, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """Return the cached value for key, calling loader() on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        epoch = self._epoch
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited failure doesn't log a warning
+            future.exception()
+            raise
+        else:
+            # Don't store a result that was fetched before an invalidation
+            if epoch == self._epoch:
+                self._store(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def peek(self, key: Tuple) -> Tuple[bool, Any]:
+        """(found, value) for key, even if the entry has expired or was invalidated."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        self.stale_hits += 1
+        return True, entry[1]
+
+    def set(self, key: Tuple, value: Any, ttl: float):
+        """Store a value fetched elsewhere (e.g. from a sync response)."""
+        self._store(key, value, ttl)
+
+    def _store(self, key: Tuple, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *resources: Hashable) -> int:
+        """Expire entries for the given resources (all entries if none given).
+        They are refetched on next use but still available to peek()."""
+        self._epoch += 1
+        stale = [key for key in self._entries if not resources or key[0] in resources]
+        for key in stale:
+            self._entries[key] = (0.0, self._entries[key][1])
+        return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits
+        }
@@ -0,0 +1,303 @@
+"""
+In-memory event store for Brahma 26 Bot
+Holds the whole events table with indexes, so handlers answer without a network hop.
+"""
+import os
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from api_client import fetch_all_events, fetch_changes, prime_content
+from replica import Replica
+
+logger = logging.getLogger(__name__)
+
+# Event times are stored as local fest time without a zone
+FEST_TZ = ZoneInfo(os.getenv("FEST_TIMEZONE", "Asia/Kolkata"))
+
+# Sort key: (start_time, id). Times are ISO strings, which sort chronologically.
+Key = Tuple[str, int]
+
+def _time(value: Optional[str]) -> str:
+    """Normalise '2026-01-25 18:00' and '2026-01-25T18:00:00' to one comparable form."""
+    return (value or "").replace(" ", "T")
+
+def _duration(event: Dict) -> timedelta:
+    """end_time - start_time, zero if either is missing or unreadable."""
+    try:
+        start = datetime.fromisoformat(_time(event.get("start_time")))
+        return datetime.fromisoformat(_time(event.get("end_time"))) - start
+    except ValueError:
+        return timedelta(0)
+
+def fest_now() -> str:
+    """Current fest-local time in the same form as _time()."""
+    return datetime.now(FEST_TZ).strftime("%Y-%m-%dT%H:%M:%S")
+
+class EventStore:
+    """Active events indexed by id, category, venue and start time.
+
+    Every index is a sorted list of (start_time, id) keys, so lookups are a dict
+    access plus a bisect. Inactive events are kept by id (deep links still work)
+    but are left out of the listing indexes.
+    """
+
+    def __init__(self, refresh_interval: float = 300, replica: Optional[Replica] = None):
+        self.refresh_interval = refresh_interval
+        self.replica = replica
+        self._by_id: Dict[int, Dict] = {}
+        self._timeline: List[Key] = []
+        self._by_category: Dict[str, List[Key]] = {}
+        self._by_venue: Dict[str, List[Key]] = {}
+        self._with_results: List[Key] = []
+        # Upper bound on any active event's duration: how far back happening_now() looks
+        self._longest = timedelta(0)
+        self.version = 0
+        self.loaded = False
+        self.cursor: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # --- Index maintenance ---
+
+    @staticmethod
+    def _key(event: Dict) -> Key:
+        return (_time(event.get("start_time")), event["id"])
+
+    @staticmethod
+    def _remove(index: List[Key], key: Key):
+        i = bisect_left(index, key)
+        if i < len(index) and index[i] == key:
+            del index[i]
+
+    def _unindex(self, event: Dict):
+        key = self._key(event)
+        self._remove(self._timeline, key)
+        self._remove(self._by_category.get(event.get("category"), []), key)
+        self._remove(self._by_venue.get(event.get("venue"), []), key)
+        self._remove(self._with_results, key)
+
+    def _index(self, event: Dict):
+        if not event.get("is_active"):
+            return
+        key = self._key(event)
+        insort(self._timeline, key)
+        insort(self._by_category.setdefault(event.get("category"), []), key)
+        insort(self._by_venue.setdefault(event.get("venue"), []), key)
+        if (event.get("results") or "").strip():
+            insort(self._with_results, key)
+        self._longest = max(self._longest, _duration(event))
+
+    def apply(self, rows: Iterable[Dict]) -> int:
+        """Insert or update events. Returns how many actually changed."""
+        changed = 0
+        for row in rows:
+            old = self._by_id.get(row["id"])
+            if old == row:
+                continue
+            if old is not None:
+                self._unindex(old)
+            self._by_id[row["id"]] = row
+            self._index(row)
+            changed += 1
+        if changed:
+            self.version += 1
+        return changed
+
+    def remove(self, event_ids: Iterable[int]) -> int:
+        """Forget events entirely (deleted upstream). Returns how many were known."""
+        removed = 0
+        for event_id in event_ids:
+            old = self._by_id.pop(event_id, None)
+            if old is not None:
+                self._unindex(old)
+                removed += 1
+        if removed:
+            self.version += 1
+        return removed
+
+    def replace(self, rows: List[Dict]):
+        """Load a full snapshot: apply it and drop anything no longer present."""
+        ids = {row["id"] for row in rows}
+        self.remove([event_id for event_id in self._by_id if event_id not in ids])
+        self.apply(rows)
+        # Removals never shrink the bound; a full snapshot resets it
+        self._longest = max((_duration(self._by_id[i]) for _, i in self._timeline), default=timedelta(0))
+        self.loaded = True
+
+    # --- Queries ---
+
+    def _resolve(self, keys: Iterable[Key]) -> List[Dict]:
+        return [self._by_id[event_id] for _, event_id in keys]
+
+    def get(self, event_id: int) -> Optional[Dict]:
+        """Get an event by id (active or not)."""
+        return self._by_id.get(event_id)
+
+    def active(self) -> List[Dict]:
+        """All active events ordered by start time."""
+        return self._resolve(self._timeline)
+
+    def by_category(self, category: str) -> List[Dict]:
+        """Active events in a category, ordered by start time."""
+        return self._resolve(self._by_category.get(category, []))
+
+    def by_venue(self, venue: str) -> List[Dict]:
+        """Active events at a venue, ordered by start time."""
+        return self._resolve(self._by_venue.get(venue, []))
+
+    def with_results(self) -> List[Dict]:
+        """Active events with results announced, ordered by start time."""
+        return self._resolve(self._with_results)
+
+    def page(self, category: Optional[str] = None, size: int = 10,
+             after_id: Optional[int] = None, before_id: Optional[int] = None) -> Tuple[List[Dict], int, int]:
+        """One page of active events (all, or one category) in start-time order.
+
+        Keyset pagination: pass the id of the last event shown as after_id for the next
+        page, or the first event shown as before_id for the previous one. An unknown
+        anchor id falls back to the first page. Returns (events, start offset, total).
+        """
+        index = self._timeline if category is None else self._by_category.get(category, [])
+        anchor = self._by_id.get(after_id if after_id is not None else before_id)
+
+        if anchor is None:
+            start = 0
+        elif after_id is not None:
+            start = bisect_right(index, self._key(anchor))
+        else:
+            start = max(bisect_left(index, self._key(anchor)) - size, 0)
+
+        return self._resolve(index[start:start + size]), start, len(index)
+
+    def upcoming(self, limit: int = 10, now: Optional[str] = None) -> List[Dict]:
+        """The next `limit` active events that haven't started yet."""
+        now = now or fest_now()
+        start = bisect_right(self._timeline, (now, float("inf")))
+        return self._resolve(self._timeline[start:start + limit])
+
+    def happening_now(self, now: Optional[str] = None) -> List[Dict]:
+        """Active events that have started and not yet ended.
+
+        Only events that started within the longest event duration before now can still
+        be running, so two bisects bound the slice that gets checked against end_time.
+        """
+        now = now or fest_now()
+        # A minute of slack: stored times may leave out seconds, which sorts them earlier
+        earliest = (datetime.fromisoformat(now) - self._longest - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%S")
+        low = bisect_left(self._timeline, (earliest, -1))
+        high = bisect_right(self._timeline, (now, float("inf")))
+        return [e for e in self._resolve(self._timeline[low:high]) if _time(e.get("end_time")) > now]
+
+    # --- Sync ---
+
+    async def refresh(self):
+        """Pull changes since the last sync cursor (a full snapshot the first time).
+        Keeps the current data if the API is down."""
+        async with self._lock:
+            before = self.version
+            try:
+                changes = await fetch_changes(self.cursor)
+                if changes is None:
+                    # API without /api/sync: fall back to a full reload every time
+                    changes = {"full": True, "events": await fetch_all_events(), "cursor": None}
+                if changes.get("full"):
+                    self.replace(changes.get("events", []))
+                else:
+                    self.apply(changes.get("events", []))
+                    self.remove(changes.get("deleted", []))
+                prime_content(changes.get("content", []))
+            except Exception as e:
+                logger.warning(f"Event store refresh failed: {e}")
+                return
+            self.cursor = changes.get("cursor")
+            if self.version != before:
+                logger.info(f"📚 Event store updated: {len(self._by_id)} events (v{self.version})")
+            await self._save(changes)
+
+    async def _save(self, changes: Dict):
+        """Write a sync result to the local replica (off the event loop)."""
+        if self.replica is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self.replica.save, changes.get("events", []), changes.get("deleted", []),
+                changes.get("content", []), changes.get("cursor"), bool(changes.get("full"))
+            )
+        except Exception as e:
+            logger.warning(f"Could not update local replica: {e}")
+
+    async def hydrate(self):
+        """Load the last synced copy from the local replica, before the first network sync.
+        The next refresh then only asks for changes since the saved cursor."""
+        if self.replica is None:
+            return
+        try:
+            events, content, cursor = await asyncio.to_thread(self.replica.load)
+        except Exception as e:
+            logger.warning(f"Could not read local replica: {e}")
+            return
+        if not events and cursor is None:
+            return
+        self.replace(events)
+        prime_content(content)
+        self.cursor = cursor
+        logger.info(f"💾 Loaded {len(events)} events from local replica (cursor {cursor})")
+
+    async def ensure_loaded(self):
+        """Load once on demand if the background refresh hasn't succeeded yet."""
+        if not self.loaded:
+            await self.refresh()
+
+    def request_refresh(self):
+        """Wake the refresh loop now (e.g. after an admin edit)."""
+        if self._wakeup:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the background refresh loop (call from the running event loop)."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.replica is not None:
+            self.replica.close()
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Store size, version and sync cursor."""
+        return {
+            "events": len(self._by_id),
+            "active": len(self._timeline),
+            "version": self.version,
+            "cursor": self.cursor
+        }
+
+# Set BOT_REPLICA_PATH to an empty string to run without a local copy
+_replica_path = os.getenv("BOT_REPLICA_PATH", os.path.join(os.path.dirname(__file__), "replica.db"))
+
+store = EventStore(
+    refresh_interval=float(os.getenv("EVENT_STORE_REFRESH", 300)),
+    replica=Replica(_replica_path) if _replica_path else None
+)
@@ -8,31 +8,23 @@ from telegram.ext import ContextTypes
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from api_client import get_events, get_event
+from api_client import degraded, get_event
+from event_store import store
+from telemetry import log_interaction
+from render import STALE_NOTE, Screen, render_cache, with_stale_note
+from handlers.screens import BACK_TO_CATEGORIES_MARKUP
 
-async def category_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle category selection."""
-    query = update.callback_query
-    await query.answer()
-    
-    category = query.data.replace("cat_", "")
-    
-    if category == "all":
-        events = get_events()
-    else:
-        events = get_events(category=category)
-    
+PAGE_SIZE = 10
+
+def build_category(category: str, events, start: int, total: int) -> Screen:
+    """Render one page of the event list for a category."""
     if not events:
-        keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_events")]]
-        await query.edit_message_text(
-            f"No events found in '{category}'.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
-        )
-        return
+        # Plain text: category names aren't Markdown-escaped
+        return Screen(f"No events found in '{category}'.", BACK_TO_CATEGORIES_MARKUP, parse_mode=None)
     
     # Show list of events
     keyboard = []
-    for event in events[:10]:  # Limit to 10
+    for event in events:
         keyboard.append([
             InlineKeyboardButton(
                 f"🎭 {event.get('name', 'Unknown')}",
@@ -40,20 +32,66 @@ async def category_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
         ])
     
+    # Keyset navigation: anchor on the first/last event shown
+    nav = []
+    if start > 0:
+        nav.append(InlineKeyboardButton("◀️ Prev", callback_data=f"events_{category}_p{events[0]['id']}"))
+    if start + len(events) < total:
+        nav.append(InlineKeyboardButton("Next ▶️", callback_data=f"events_{category}_n{events[-1]['id']}"))
+    if nav:
+        keyboard.append(nav)
+    
     keyboard.append([InlineKeyboardButton("🔙 Back to Categories", callback_data="menu_events")])
     
     title = "All Events" if category == "all" else category
-    await query.edit_message_text(
-        f"📅 *{title}*\n\nSelect an event to view details:",
-        parse_mode="Markdown",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+    text = f"📅 *{title}*\n\nSelect an event to view details:"
+    if total > PAGE_SIZE:
+        # Anchors can land mid-page (e.g. "Later events" from the timeline), so count
+        # the pages before and from this one rather than assuming multiples of PAGE_SIZE
+        before = -(-start // PAGE_SIZE)
+        pages = before + -(-(total - start) // PAGE_SIZE)
+        text += f"\n_Page {before + 1} of {pages}_"
+    return Screen(text, InlineKeyboardMarkup(keyboard))
+
+async def show_event_page(query, category: str, after_id=None, before_id=None):
+    """Show a page of events for a category ("all" for every category)."""
+    await store.ensure_loaded()
+    events, start, total = store.page(
+        None if category == "all" else category, PAGE_SIZE, after_id=after_id, before_id=before_id
     )
+    
+    # Pages are cached per position, so page N costs the same as page 1
+    screen = render_cache.get(
+        f"category:{category}:{start}", store.version,
+        lambda: build_category(category, events, start, total)
+    )
+    screen = with_stale_note(screen)
+    await query.edit_message_text(screen.text, parse_mode=screen.parse_mode, reply_markup=screen.markup)
+
+async def category_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle category selection."""
+    query = update.callback_query
+    await query.answer()
+    
+    category = query.data.replace("cat_", "")
+    await show_event_page(query, category)
 
 async def events_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle events list navigation."""
+    """Handle events list navigation (events_<category>_n<id> / events_<category>_p<id>)."""
     query = update.callback_query
     await query.answer()
-    # Placeholder for pagination if needed
+    
+    try:
+        category, anchor = query.data.replace("events_", "", 1).rsplit("_", 1)
+        direction, anchor_id = anchor[0], int(anchor[1:])
+    except (ValueError, IndexError):
+        await show_event_page(query, "all")
+        return
+    
+    if direction == "p":
+        await show_event_page(query, category, before_id=anchor_id)
+    else:
+        await show_event_page(query, category, after_id=anchor_id)
 
 async def event_detail_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show event details with poster."""
@@ -61,11 +99,11 @@ async def event_detail_callback(update: Update, context: ContextTypes.DEFAULT_TY
     await query.answer()
     
     event_id = int(query.data.replace("event_", ""))
-    event = get_event(event_id)
+    await store.ensure_loaded()
+    event = store.get(event_id) or await get_event(event_id)
     
     if not event:
-        keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_events")]]
-        await query.edit_message_text("Event not found.", reply_markup=InlineKeyboardMarkup(keyboard))
+        await query.edit_message_text("Event not found.", reply_markup=BACK_TO_CATEGORIES_MARKUP)
         return
     
     # Build event details text
@@ -95,17 +133,15 @@ async def event_detail_callback(update: Update, context: ContextTypes.DEFAULT_TY
     if event.get('hashtags'):
         text += f"\n{event.get('hashtags')}"
     
+    if degraded():
+        text += f"\n\n_{STALE_NOTE}_"
+    
     keyboard = [
         [InlineKeyboardButton("🔙 Back to Events", callback_data="menu_events")]
     ]
     
     # Log interaction
-    user_id = update.effective_user.id
-    try:
-        from api_client import log_interaction
-        log_interaction(user_id, "view_event", event.get("name", "Unknown"))
-    except:
-        pass
+    log_interaction(update.effective_user.id, "view_event", event.get("name", "Unknown"))
 
     # If event has a poster, send as photo
     if event.get('poster_file_id'):
@@ -1,13 +1,14 @@
 """
 Menu callback handlers
 """
-import os
-import requests
+import json
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from api_client import get_content, get_categories, get_events
-
-API_BASE = os.getenv("API_BASE_URL", "http://127.0.0.1:3000")
+from api_client import get_content, data_version
+from event_store import store
+from health import monitor
+from render import Screen, render_cache, with_stale_note
+from handlers.screens import MAIN_MENU, EVENT_CATEGORIES, DEVELOPER, BACK_TO_MENU_MARKUP
 
 async def menu_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle main menu button callbacks."""
@@ -31,61 +32,66 @@ async def menu_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     elif action == "back":
         await show_main_menu(query)
 
+async def send_screen(query, screen: Screen):
+    """Edit the current message to show a rendered screen."""
+    await query.edit_message_text(screen.text, parse_mode=screen.parse_mode, reply_markup=screen.markup)
+
 async def show_main_menu(query):
     """Show main menu."""
-    keyboard = [
-        [InlineKeyboardButton("📅 Event Details", callback_data="menu_events")],
-        [InlineKeyboardButton("⏰ Event Timeline", callback_data="menu_timeline")],
-        [InlineKeyboardButton("📞 Contact Team", callback_data="menu_contact")],
-        [InlineKeyboardButton("🏆 Event Results", callback_data="menu_results")],
-        [InlineKeyboardButton("🤖 Bot Status", callback_data="menu_status")],
-        [InlineKeyboardButton("👨‍💻 Developer Info", callback_data="menu_developer")]
-    ]
-    
-    await query.edit_message_text(
-        "🎊 *Brahma'26 helpline Bot!* 🎉\n\nHow can I help you today?",
-        parse_mode="Markdown",
-        reply_markup=InlineKeyboardMarkup(keyboard)
-    )
+    await send_screen(query, MAIN_MENU)
 
 async def show_categories(query):
     """Show event categories."""
-    categories = ["Technical", "Cultural", "General"]
-    
-    keyboard = [[InlineKeyboardButton(f"📂 {cat}", callback_data=f"cat_{cat}")] for cat in categories]
-    keyboard.append([InlineKeyboardButton("📋 All Events", callback_data="cat_all")])
-    keyboard.append([InlineKeyboardButton("🔙 Back", callback_data="menu_back")])
-    
-    await query.edit_message_text(
-        "📅 *Event Details*\n\nSelect a category to view events:",
-        parse_mode="Markdown",
-        reply_markup=InlineKeyboardMarkup(keyboard)
-    )
+    await send_screen(query, EVENT_CATEGORIES)
 
-async def show_timeline(query):
-    """Show event timeline."""
-    events = get_events(active_only=True)
-    
+def build_timeline(live, upcoming, has_more: bool) -> Screen:
+    """Render the event timeline screen."""
     text = "⏰ *Event Timeline*\n\n"
-    if events:
-        for e in events[:10]:  # Show max 10 events
+    if live:
+        text += "🔴 *Happening now*\n\n"
+        for e in live:
+            name = e.get('name', 'Event')
+            venue = e.get('venue') or 'TBD'
+            text += f"• *{name}*\n  📍 {venue}\n\n"
+        if upcoming:
+            text += "🗓 *Coming up*\n\n"
+    if upcoming:
+        for e in upcoming:
             name = e.get('name', 'Event')
             time = e.get('start_time', 'TBD')
             text += f"• *{name}*\n  📍 {time}\n\n"
-    else:
+    elif not live:
         text += "No upcoming events scheduled."
     
-    keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_back")]]
-    await query.edit_message_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(keyboard))
-
-async def show_contact(query):
-    """Show contact team information."""
-    content = get_content("emergency_contacts")
+    if not has_more:
+        return Screen(text, BACK_TO_MENU_MARKUP)
     
+    # Continue in the full schedule right after the last event shown
+    keyboard = [
+        [InlineKeyboardButton("Later events ▶️", callback_data=f"events_all_n{upcoming[-1]['id']}")],
+        [InlineKeyboardButton("🔙 Back", callback_data="menu_back")]
+    ]
+    return Screen(text, InlineKeyboardMarkup(keyboard))
+
+async def show_timeline(query):
+    """Show event timeline."""
+    await store.ensure_loaded()
+    live = store.happening_now()[:10]
+    upcoming = store.upcoming(10 - len(live))  # Show max 10 events
+    has_more = False
+    if upcoming:
+        _, start, total = store.page(size=1, after_id=upcoming[-1]["id"])
+        has_more = start < total
+    # What's on screen depends on the clock as well as the data
+    version = (store.version, tuple(e["id"] for e in live), tuple(e["id"] for e in upcoming))
+    screen = render_cache.get("timeline", version, lambda: build_timeline(live, upcoming, has_more))
+    await send_screen(query, with_stale_note(screen))
+
+def build_contact(content) -> Screen:
+    """Render the contact team screen."""
     text = "📞 *Contact Team*\n\n"
     if content:
         try:
-            import json
             contacts = json.loads(content)
             for c in contacts:
                 text += f"👤 *{c.get('name', '')}*\n📱 {c.get('phone', '')}\n\n"
@@ -93,17 +99,16 @@ async def show_contact(query):
             text += "Contact information unavailable."
     else:
         text += "No contacts available yet.\nCheck back soon!"
-    
-    keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_back")]]
-    await query.edit_message_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(keyboard))
+    return Screen(text, BACK_TO_MENU_MARKUP)
 
-async def show_results(query):
-    """Show event results."""
-    events = get_events()
-    
-    # Filter events that have results
-    events_with_results = [e for e in events if e.get('results') and e.get('results').strip()]
-    
+async def show_contact(query):
+    """Show contact team information."""
+    content = await get_content("emergency_contacts")
+    screen = render_cache.get("contact", data_version("content"), lambda: build_contact(content))
+    await send_screen(query, with_stale_note(screen))
+
+def build_results(events_with_results) -> Screen:
+    """Render the event results screen."""
     text = "🏆 *Event Results*\n\n"
     
     if events_with_results:
@@ -116,47 +121,56 @@ async def show_results(query):
     else:
         text += "No results announced yet.\n"
         text += "Stay tuned for updates! 🎉"
-    
-    keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_back")]]
-    await query.edit_message_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(keyboard))
+    return Screen(text, BACK_TO_MENU_MARKUP)
+
+async def show_results(query):
+    """Show event results."""
+    await store.ensure_loaded()
+    events = store.with_results()
+    screen = render_cache.get("results", store.version, lambda: build_results(events))
+    await send_screen(query, with_stale_note(screen))
+
+def _ago(seconds: float) -> str:
+    if seconds < 60:
+        return f"{int(seconds)}s ago"
+    return f"{int(seconds // 60)} min ago"
 
 async def show_status(query):
-    """Show bot status."""
-    try:
-        r = requests.get(f"{API_BASE}/api/health", timeout=5)
-        if r.status_code == 200:
-            data = r.json()
-            db_status = "✅ Connected" if data.get("database") == "connected" else "❌ Disconnected"
-            api_status = "✅ Online"
-        else:
-            db_status = "❌ Error"
-            api_status = "⚠️ Unstable"
-    except:
-        db_status = "❌ Offline"
+    """Show bot status from the health monitor's last probes (no request on tap)."""
+    health = monitor.snapshot()
+    ago = monitor.last_checked_ago()
+    if ago is None:
+        text = """🤖 *Bot Status*
+
+*Bot:* ✅ Running
+_Health checks are starting, try again in a moment._"""
+        await send_screen(query, Screen(text, BACK_TO_MENU_MARKUP))
+        return
+
+    if health["api"] == "online":
+        api_status = "✅ Online" if health["status"] == "healthy" else "⚠️ Unstable"
+    else:
         api_status = "❌ Offline"
-    
+    db_status = {
+        "connected": "✅ Connected",
+        "disconnected": "❌ Disconnected",
+        "error": "❌ Error"
+    }.get(health["database"], "❓ Unknown")
+
     text = f"""🤖 *Bot Status*
 
 *API Status:* {api_status}
 *Database:* {db_status}
 *Bot:* ✅ Running
+"""
+    if health["latency_p50_ms"] is not None:
+        text += f"*API Latency:* {health['latency_p50_ms']:.0f} ms\n"
+    if health["error_rate"]:
+        text += f"*Failed Checks:* {health['error_rate']:.0%} of last {health['window']}\n"
+    text += f"\n_Last checked: {_ago(ago)}_"
 
-_Last checked: just now_"""
-    
-    keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_back")]]
-    await query.edit_message_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(keyboard))
+    await send_screen(query, Screen(text, BACK_TO_MENU_MARKUP))
 
 async def show_developer(query):
     """Show developer info."""
-    text = """👨‍💻 *Developer Info*
-
-*Developed by:* Brahma'26 Tech Team
-*Version:* 2.0.0
-*Platform:* Vercel + Render
-
-💡 _Built with ❤️ for Brahma 2026_
-
-For issues, contact the organizing committee."""
-    
-    keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="menu_back")]]
-    await query.edit_message_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(keyboard))
+    await send_screen(query, DEVELOPER)
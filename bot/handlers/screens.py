@@ -0,0 +1,59 @@
+"""
+Static screens shared by handlers
+Built once at import; InlineKeyboardMarkup is immutable, so they are safe to reuse.
+"""
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from render import Screen
+
+CATEGORIES = ["Technical", "Cultural", "General"]
+
+MAIN_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📅 Event Details", callback_data="menu_events")],
+    [InlineKeyboardButton("⏰ Event Timeline", callback_data="menu_timeline")],
+    [InlineKeyboardButton("📞 Contact Team", callback_data="menu_contact")],
+    [InlineKeyboardButton("🏆 Event Results", callback_data="menu_results")],
+    [InlineKeyboardButton("🤖 Bot Status", callback_data="menu_status")],
+    [InlineKeyboardButton("👨‍💻 Developer Info", callback_data="menu_developer")]
+])
+
+BACK_TO_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data="menu_back")]])
+
+BACK_TO_CATEGORIES_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data="menu_events")]])
+
+WELCOME = Screen(
+    """🎊 *Brahma'26 helpline Bot!* 🎉
+
+I'm here to assist you with Brahma'26 😊.
+How can I help you today?""",
+    MAIN_MENU_MARKUP
+)
+
+MAIN_MENU = Screen(
+    "🎊 *Brahma'26 helpline Bot!* 🎉\n\nHow can I help you today?",
+    MAIN_MENU_MARKUP
+)
+
+EVENT_CATEGORIES = Screen(
+    "📅 *Event Details*\n\nSelect a category to view events:",
+    InlineKeyboardMarkup(
+        [[InlineKeyboardButton(f"📂 {cat}", callback_data=f"cat_{cat}")] for cat in CATEGORIES]
+        + [
+            [InlineKeyboardButton("📋 All Events", callback_data="cat_all")],
+            [InlineKeyboardButton("🔙 Back", callback_data="menu_back")]
+        ]
+    )
+)
+
+DEVELOPER = Screen(
+    """👨‍💻 *Developer Info*
+
+*Developed by:* Brahma'26 Tech Team
+*Version:* 2.0.0
+*Platform:* Vercel + Render
+
+💡 _Built with ❤️ for Brahma 2026_
+
+For issues, contact the organizing committee.""",
+    BACK_TO_MENU_MARKUP
+)
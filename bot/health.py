@@ -0,0 +1,132 @@
+"""
+Health monitor for Brahma 26 Bot
+Probes the admin API and database in the background and keeps a rolling window of
+latency and errors, so the Status button and the admin health page never wait on a check.
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, NamedTuple, Optional
+
+from api_client import breaker, get_health, send_heartbeat
+from breaker import OPEN
+from event_store import store
+from quantiles import quantiles
+
+logger = logging.getLogger(__name__)
+
+class Probe(NamedTuple):
+    checked_at: float
+    latency_ms: float
+    api_ok: bool
+    database: str
+    error: Optional[str]
+
+class HealthMonitor:
+    """Probes /api/health every `interval` seconds and remembers the last `window` probes.
+
+    After each probe a heartbeat with the current snapshot is posted to the admin API,
+    which is how the admin health page knows the bot is alive.
+    """
+
+    def __init__(self, interval: float = 30, window: int = 20):
+        self.interval = interval
+        # Heartbeats go to a bot-only route; off without BOT_SHARED_SECRET
+        self.send_heartbeats = True
+        self._probes: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.started_at = time.time()
+        self.heartbeats_failed = 0
+
+    def start(self):
+        """Start probing (call from the running event loop)."""
+        if self._task is None:
+            self.started_at = time.time()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe()
+                await self.heartbeat()
+            except Exception as e:
+                logger.error(f"❌ Health check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def probe(self) -> Probe:
+        """Check the API and database once and add the result to the window."""
+        started = time.perf_counter()
+        data = await get_health()
+        latency = (time.perf_counter() - started) * 1000
+        if data:
+            probe = Probe(time.time(), latency, True, data.get("database", "unknown"), None)
+        elif data is not None:
+            probe = Probe(time.time(), latency, False, "error", "API returned an error status")
+        else:
+            error = "API calls paused after repeated failures" if breaker.state == OPEN else "API unreachable"
+            probe = Probe(time.time(), latency, False, "unknown", error)
+        if not probe.api_ok and (not self._probes or self._probes[-1].api_ok):
+            logger.warning(f"⚠️ API health check failing: {probe.error}")
+        self._probes.append(probe)
+        return probe
+
+    async def heartbeat(self):
+        """Post the snapshot to the admin API. Failures are counted, never raised."""
+        if not self.send_heartbeats:
+            return
+        try:
+            await send_heartbeat(self.snapshot())
+        except Exception as e:
+            self.heartbeats_failed += 1
+            logger.warning(f"Heartbeat failed: {e}")
+
+    def snapshot(self) -> Dict:
+        """Current health from memory: last probe plus latency and error rate over the window."""
+        probes = list(self._probes)
+        last = probes[-1] if probes else None
+        latency = quantiles([p.latency_ms for p in probes if p.api_ok], (0.50, 0.95))
+        return {
+            "status": self._status(probes),
+            "api": None if last is None else ("online" if last.api_ok else "offline"),
+            "database": last.database if last else None,
+            "latency_p50_ms": latency[0.50],
+            "latency_p95_ms": latency[0.95],
+            "error_rate": round(sum(not p.api_ok for p in probes) / len(probes), 3) if probes else None,
+            "window": len(probes),
+            "circuit": breaker.state,
+            "last_error": next((p.error for p in reversed(probes) if p.error), None),
+            "checked_at": datetime.fromtimestamp(last.checked_at, timezone.utc).isoformat() if last else None,
+            "uptime_seconds": int(time.time() - self.started_at),
+            "events": store.stats()["events"]
+        }
+
+    def _status(self, probes) -> str:
+        if not probes:
+            return "starting"
+        last = probes[-1]
+        if not last.api_ok or last.database != "connected":
+            return "unhealthy"
+        if any(not p.api_ok for p in probes):
+            return "degraded"
+        return "healthy"
+
+    def last_checked_ago(self) -> Optional[float]:
+        """Seconds since the last probe, None before the first one."""
+        return time.time() - self._probes[-1].checked_at if self._probes else None
+
+monitor = HealthMonitor(
+    interval=float(os.getenv("HEALTH_CHECK_INTERVAL", 30)),
+    window=int(os.getenv("HEALTH_WINDOW", 20))
+)
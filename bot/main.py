@@ -2,19 +2,30 @@
 Brahma 26 Telegram Bot - Main Entry
 """
 import os
+import signal
+import asyncio
 import logging
-import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import secrets
+from aiohttp import web
 from dotenv import load_dotenv
 from telegram import Update
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler
 
+# Load environment (before importing modules that read it)
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+
 from handlers.start import start_command
 from handlers.events import events_callback, event_detail_callback, category_callback
 from handlers.menu import menu_callback
-
-# Load environment
-load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+from api_client import breaker, close_client, has_bot_secret
+from server import WEBHOOK_PATH, create_web_app
+from update_processor import ChatOrderedUpdateProcessor
+from event_store import store
+from broadcast import create_broadcaster
+from health import monitor as health_monitor
+from metrics import loop_monitor, timed
+import registrations
+import telemetry
 
 # Logging
 logging.basicConfig(
@@ -23,49 +34,135 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Simple HTTP health server for Render (free tier workaround)
-class HealthHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        self.send_response(200)
-        self.send_header('Content-type', 'text/plain')
-        self.end_headers()
-        self.wfile.write(b'Bot is running!')
-    
-    def log_message(self, format, *args):
-        pass  # Suppress HTTP logs
-
-def start_health_server():
+async def on_startup(app: Application):
+    """Start background tasks."""
+    # Broadcasts, telemetry, registrations and heartbeats use bot-only API routes,
+    # which refuse every call without the shared secret
+    bot_routes = has_bot_secret()
+    if not bot_routes:
+        logger.warning("⚠️ BOT_SHARED_SECRET not set: broadcasts, telemetry, user registration and heartbeats are off")
+    telemetry.queue.enabled = registrations.queue.enabled = bot_routes
+    health_monitor.send_heartbeats = bot_routes
+    if bot_routes:
+        telemetry.queue.start()
+        registrations.queue.start()
+    loop_monitor.start()
+    # Serve the last synced data right away; the first sync only fetches what changed
+    await store.hydrate()
+    store.start()
+    # Catch up on edits made while the API was unreachable
+    breaker.on_close = store.request_refresh
+    app.bot_data["broadcaster"] = create_broadcaster(app.bot, app.job_queue)
+    if bot_routes:
+        app.bot_data["broadcaster"].start()
+    health_monitor.start()
+
+async def on_shutdown(app: Application):
+    """Release shared resources when the bot stops."""
+    await health_monitor.stop()
+    await app.bot_data["broadcaster"].stop()
+    await store.stop()
+    await registrations.queue.stop()
+    await telemetry.queue.stop()
+    await loop_monitor.stop()
+    await close_client()
+
+def build_application(token: str, webhook: bool, base_url: str = None) -> Application:
+    """Create the Application and register handlers. base_url points the bot at
+    another Bot API server (e.g. the fake one in scripts/bench_bot.py)."""
+    # Past ~16 updates at once, throughput drops (scripts/bench_bot.py): more concurrency
+    # only queues requests in the HTTP pool
+    workers = int(os.getenv("BOT_CONCURRENT_UPDATES", 16))
+    builder = (
+        Application.builder()
+        .token(token)
+        # Updates run side by side, but each chat's updates stay in order
+        .concurrent_updates(ChatOrderedUpdateProcessor(
+            workers=workers,
+            max_pending=int(os.getenv("BOT_MAX_PENDING_UPDATES", 4096))
+        ))
+        # One Bot API connection per worker, plus a few for broadcasts and jobs
+        .connection_pool_size(workers + 4)
+    )
+    if base_url:
+        builder = builder.base_url(base_url)
+    if webhook:
+        # Updates arrive through our own HTTP server, no polling Updater needed
+        builder = builder.updater(None)
+    app = builder.build()
+
+    # Every callback is timed for /metrics
+
+    # Command handlers
+    app.add_handler(CommandHandler("start", timed(start_command)))
+
+    # Callback query handlers (inline buttons)
+    app.add_handler(CallbackQueryHandler(timed(menu_callback), pattern="^menu_"))
+    app.add_handler(CallbackQueryHandler(timed(category_callback), pattern="^cat_"))
+    app.add_handler(CallbackQueryHandler(timed(events_callback), pattern="^events_"))
+    app.add_handler(CallbackQueryHandler(timed(event_detail_callback), pattern="^event_"))
+
+    return app
+
+async def run(app: Application, webhook_url: str):
+    """Serve HTTP on $PORT and receive updates by webhook or polling until stopped."""
     port = int(os.getenv("PORT", 10000))
-    server = HTTPServer(('0.0.0.0', port), HealthHandler)
-    logger.info(f"🌐 Health server running on port {port}")
-    server.serve_forever()
+    webhook_secret = None
+    if webhook_url:
+        # Telegram echoes this back on every webhook call; a fresh one per start is fine
+        webhook_secret = os.getenv("TELEGRAM_WEBHOOK_SECRET") or secrets.token_urlsafe(32)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    runner = web.AppRunner(create_web_app(app, webhook_secret), access_log=None)
+    await runner.setup()
+
+    async with app:
+        await on_startup(app)
+        await app.start()
+        # Listen before registering the webhook, so Telegram's first deliveries land
+        await web.TCPSite(runner, "0.0.0.0", port).start()
+        logger.info(f"🌐 HTTP server running on port {port}")
+
+        if webhook_url:
+            await app.bot.set_webhook(
+                url=webhook_url.rstrip("/") + WEBHOOK_PATH,
+                secret_token=webhook_secret,
+                allowed_updates=Update.ALL_TYPES
+            )
+            logger.info("🪝 Webhook mode")
+        else:
+            # A webhook left over from an earlier deploy would block getUpdates
+            await app.bot.delete_webhook()
+            await app.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+            logger.info("🔁 Polling mode")
+
+        await stop.wait()
+
+        logger.info("🛑 Shutting down...")
+        await runner.cleanup()
+        if app.updater:
+            await app.updater.stop()
+        await app.stop()
+        await on_shutdown(app)
 
 def main():
     """Start the bot."""
     token = os.getenv("TELEGRAM_BOT_TOKEN")
-    
+
     if not token:
         logger.error("TELEGRAM_BOT_TOKEN not set in .env")
         return
-    
-    # Start health server in background (for Render free tier)
-    threading.Thread(target=start_health_server, daemon=True).start()
-    
-    # Create application
-    app = Application.builder().token(token).build()
-    
-    # Command handlers
-    app.add_handler(CommandHandler("start", start_command))
-    
-    # Callback query handlers (inline buttons)
-    app.add_handler(CallbackQueryHandler(menu_callback, pattern="^menu_"))
-    app.add_handler(CallbackQueryHandler(category_callback, pattern="^cat_"))
-    app.add_handler(CallbackQueryHandler(events_callback, pattern="^events_"))
-    app.add_handler(CallbackQueryHandler(event_detail_callback, pattern="^event_"))
-    
-    # Start polling
+
+    # Setting WEBHOOK_URL (the bot's public base URL) switches from polling to webhooks
+    webhook_url = os.getenv("WEBHOOK_URL", "")
+    app = build_application(token, webhook=bool(webhook_url))
+
     logger.info("🤖 Brahma 26 Bot starting...")
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+    asyncio.run(run(app, webhook_url))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,210 @@
+"""
+Metrics for Brahma 26 Bot
+Counters, gauges and histograms rendered in the Prometheus text format on /metrics.
+"""
+import re
+import time
+import asyncio
+import logging
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from a cache hit to a slow upstream call
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics = []
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{str(v)}"'.replace("\n", " ") for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        _metrics.append(self)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(Metric):
+    """Monotonic count per label set."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+class Gauge(Metric):
+    """Value read at scrape time from a callback returning {label values: value}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Dict[Tuple, float]],
+                 labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self.read = read
+
+    def samples(self):
+        try:
+            values = self.read()
+        except Exception as e:
+            logger.warning(f"Metric {self.name} unavailable: {e}")
+            return
+        for labels, value in sorted(values.items()):
+            if value is not None:
+                yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+class CounterFunc(Gauge):
+    """Cumulative total read at scrape time, e.g. a cache's own hit counter."""
+    kind = "counter"
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram per label set."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (), buckets=BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            # Per-bucket counts, then sum and count
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self):
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {series[-1]}"
+
+_scrape = 0
+
+def per_scrape(read: Callable[[], Dict]) -> Callable[[], Dict]:
+    """Wrap a stats function so every collector in one scrape shares a single call."""
+    cached = {"scrape": None, "value": None}
+
+    def snapshot():
+        if cached["scrape"] != _scrape:
+            cached["scrape"], cached["value"] = _scrape, read()
+        return cached["value"]
+    return snapshot
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    global _scrape
+    _scrape += 1
+    return "\n".join(metric.render() for metric in _metrics) + "\n"
+
+# --- Bot metrics ---
+
+HANDLER_SECONDS = Histogram("bot_handler_seconds", "Time spent handling an update, by handler", ["handler"])
+HANDLER_ERRORS = Counter("bot_handler_errors_total", "Updates whose handler raised, by handler", ["handler"])
+
+API_SECONDS = Histogram("bot_api_request_seconds", "Admin API call latency, by route", ["method", "route"])
+API_REQUESTS = Counter("bot_api_requests_total", "Admin API calls, by route and status (or 'error')",
+                       ["method", "route", "status"])
+API_FALLBACKS = Counter("bot_api_fallbacks_total",
+                        "API calls that failed and were answered with a default instead of raising", ["resource"])
+
+LOOP_LAG = Histogram("bot_event_loop_lag_seconds", "How late a periodic event-loop wakeup ran")
+
+def timed(callback: Callable) -> Callable:
+    """Wrap a handler callback to record its latency and failures."""
+    name = callback.__name__
+
+    @wraps(callback)
+    async def wrapper(update, context):
+        started = time.perf_counter()
+        try:
+            return await callback(update, context)
+        except Exception:
+            HANDLER_ERRORS.inc(name)
+            raise
+        finally:
+            HANDLER_SECONDS.observe(time.perf_counter() - started, name)
+    return wrapper
+
+def route_of(path: str) -> str:
+    """Path with ids replaced, so /api/events/12 and /api/events/13 share a label."""
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path)
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """httpx transport that times every request and counts it by route and status."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        route = route_of(request.url.path)
+        started = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            API_REQUESTS.inc(request.method, route, "error")
+            raise
+        finally:
+            API_SECONDS.observe(time.perf_counter() - started, request.method, route)
+        API_REQUESTS.inc(request.method, route, str(response.status_code))
+        return response
+
+class LoopLagMonitor:
+    """Measures event-loop lag: how much later than scheduled a sleep wakes up."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(loop.time() - expected, 0.0))
+
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,13 @@
+"""
+Quantiles for Brahma 26 Bot
+Small helpers for the latency windows kept by the broadcaster and the health monitor.
+"""
+from typing import Dict, Iterable, Optional
+
+def quantiles(samples, qs: Iterable[float]) -> Dict[float, Optional[float]]:
+    """Several quantiles (0-1) of a list of numbers from one sort; None for each if empty."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {q: None for q in qs}
+    last = len(ordered) - 1
+    return {q: round(ordered[min(int(q * len(ordered)), last)], 2) for q in qs}
@@ -0,0 +1,173 @@
+"""
+Registration queue for Brahma 26 Bot
+Remembers which users are already registered and writes new users and last_active
+updates to the API in batches, so /start never waits on the database.
+"""
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from api_client import get_recipients, register_users
+
+logger = logging.getLogger(__name__)
+
+class RegistrationQueue:
+    """Write-behind user registration.
+
+    register() never awaits: a user seen within `touch_interval` seconds is skipped,
+    anyone else is added to a pending map (so repeated /starts coalesce into one row)
+    that is flushed to /api/auth/register-bot-users by size or by time. Users already
+    in the database are loaded at startup and count as seen at that moment, so a
+    /start storm after a deploy doesn't rewrite every existing row.
+    """
+
+    def __init__(self, batch_size: int = 200, flush_interval: float = 1.0,
+                 touch_interval: float = 600, max_pending: int = 50000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.touch_interval = touch_interval
+        self.max_pending = max_pending
+        # telegram_id -> monotonic time it was last queued (or loaded)
+        self._seen: Dict[int, float] = {}
+        self._pending: Dict[int, Dict] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.warmed = False
+        self.written = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+        # Off when the API can't accept bot calls (no BOT_SHARED_SECRET)
+        self.enabled = True
+
+    def register(self, telegram_id: int, username: Optional[str] = None) -> bool:
+        """Note that a user is active. Returns False if nothing needed to be written."""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        last = self._seen.get(telegram_id)
+        if last is not None and now - last < self.touch_interval:
+            self.skipped += 1
+            return False
+        if telegram_id not in self._pending and len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+
+        self._seen[telegram_id] = now
+        self._pending[telegram_id] = {
+            "telegram_id": telegram_id,
+            "username": username,
+            # Same format as SQLite's datetime('now')
+            "seen_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if self._wakeup and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def start(self):
+        """Load known users and start the flush loop (call from the running event loop)."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def warm(self, page_size: int = 5000):
+        """Mark every user already in the database as seen. Keeps what it got on errors."""
+        after, loaded = 0, 0
+        now = time.monotonic()
+        try:
+            while True:
+                rows = await get_recipients(after, page_size)
+                for row in rows:
+                    self._seen.setdefault(int(row["telegram_id"]), now)
+                loaded += len(rows)
+                if len(rows) < page_size:
+                    break
+                after = rows[-1]["id"]
+        except Exception as e:
+            logger.warning(f"Could not load known users ({loaded} loaded): {e}")
+            return
+        self.warmed = True
+        logger.info(f"👥 Loaded {loaded} known users")
+
+    async def _run(self):
+        await self.warm()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write pending users in batches until none are left or a write fails."""
+        while self._pending:
+            ids = list(self._pending)[:self.batch_size]
+            batch = [self._pending.pop(i) for i in ids]
+            try:
+                ok = await self._send(batch)
+            except asyncio.CancelledError:
+                self._requeue(batch)
+                raise
+            if not ok:
+                self._requeue(batch)
+                return
+
+    async def _send(self, batch) -> bool:
+        try:
+            await register_users(batch)
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.warning(f"Registration flush failed ({len(batch)} users): {e}")
+            return False
+        self.written += len(batch)
+        return True
+
+    def _requeue(self, batch):
+        """Put a failed batch back, keeping newer entries for the same users.
+        Users that no longer fit are forgotten so their next /start queues them again."""
+        for user in batch:
+            telegram_id = user["telegram_id"]
+            if telegram_id in self._pending:
+                continue
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                self._seen.pop(telegram_id, None)
+                continue
+            self._pending[telegram_id] = user
+
+    def stats(self) -> Dict[str, int]:
+        """Known users, queue depth and write counters."""
+        return {
+            "known": len(self._seen),
+            "pending": len(self._pending),
+            "warmed": self.warmed,
+            "written": self.written,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes
+        }
+
+queue = RegistrationQueue(
+    batch_size=int(os.getenv("REGISTRATION_BATCH_SIZE", 200)),
+    flush_interval=float(os.getenv("REGISTRATION_FLUSH_INTERVAL", 1)),
+    touch_interval=float(os.getenv("REGISTRATION_TOUCH_INTERVAL", 600))
+)
+
+def register_user(telegram_id: int, username: Optional[str] = None) -> bool:
+    """Queue a user registration / last_active update without waiting."""
+    return queue.register(telegram_id, username)
@@ -0,0 +1,50 @@
+"""
+Render cache for Brahma 26 Bot
+Keeps ready-to-send message text and keyboards for menu screens.
+"""
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from telegram import InlineKeyboardMarkup
+
+from api_client import degraded
+
+STALE_NOTE = "⚠️ Can't reach the server right now, this may be out of date."
+
+class Screen(NamedTuple):
+    """A rendered screen: message text plus its inline keyboard."""
+    text: str
+    markup: InlineKeyboardMarkup
+    parse_mode: Optional[str] = "Markdown"
+
+def with_stale_note(screen: Screen) -> Screen:
+    """Append the out-of-date note while the API is unreachable (data comes from cache)."""
+    if not degraded():
+        return screen
+    note = f"_{STALE_NOTE}_" if screen.parse_mode else STALE_NOTE
+    return screen._replace(text=f"{screen.text}\n\n{note}")
+
+class RenderCache:
+    """One rendered Screen per name, rebuilt only when its data version changes."""
+
+    def __init__(self):
+        self._screens: Dict[str, Tuple[Hashable, Screen]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, version: Hashable, build: Callable[[], Screen]) -> Screen:
+        """Return the screen for name at version, calling build() if it is missing or outdated."""
+        entry = self._screens.get(name)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        screen = build()
+        self._screens[name] = (version, screen)
+        return screen
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and number of cached screens."""
+        return {"size": len(self._screens), "hits": self.hits, "misses": self.misses}
+
+render_cache = RenderCache()
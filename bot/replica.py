@@ -0,0 +1,127 @@
+"""
+Local replica for Brahma 26 Bot
+A SQLite copy of events, content pages and the sync cursor, so a restarted bot has
+data straight away even while the admin API or Turso is down.
+"""
+import json
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Same tables as scripts/init_db.py, plus sync_state. Columns the API adds later are
+# added on the fly, so the file can also be opened by the scripts (TURSO_DATABASE_URL=file:...).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    category TEXT,
+    description TEXT,
+    venue TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    rules TEXT,
+    is_active INTEGER DEFAULT 1,
+    poster_file_id TEXT,
+    poster_caption TEXT,
+    hashtags TEXT,
+    volunteer_contacts TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS content_pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT UNIQUE NOT NULL,
+    content TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_time, id);
+"""
+
+def _scalar(value):
+    """SQLite can't store lists/dicts; keep them as JSON text like the API does."""
+    return json.dumps(value) if isinstance(value, (list, dict)) else value
+
+class Replica:
+    """SQLite file mirroring what the bot has synced from /api/sync.
+
+    Methods are blocking; call them through asyncio.to_thread. Each sync is written
+    in one transaction together with its cursor, so the file never holds data from
+    one sync with the cursor of another.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._columns: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _ensure_columns(self, table: str, names: Iterable[str]):
+        if table not in self._columns:
+            self._columns[table] = {row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        for name in names:
+            if name not in self._columns[table] and name.isidentifier():
+                self._conn.execute(f'ALTER TABLE {table} ADD COLUMN "{name}"')
+                self._columns[table].add(name)
+
+    def _upsert(self, table: str, key: str, rows: List[Dict]):
+        for row in rows:
+            names = [name for name in row if name.isidentifier()]
+            self._ensure_columns(table, names)
+            columns = ", ".join(f'"{name}"' for name in names)
+            updates = ", ".join(f'"{name}" = excluded."{name}"' for name in names if name != key)
+            self._conn.execute(
+                f"INSERT INTO {table} ({columns}) VALUES ({', '.join('?' for _ in names)}) "
+                f"ON CONFLICT({key}) DO UPDATE SET {updates}",
+                [_scalar(row[name]) for name in names]
+            )
+
+    def save(self, events: List[Dict], deleted: List[int], content: List[Dict],
+             cursor: Optional[str], full: bool = False):
+        """Write one sync result. full=True replaces all events with `events`."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if full:
+                    conn.execute("DELETE FROM events")
+                self._upsert("events", "id", events)
+                conn.executemany("DELETE FROM events WHERE id = ?", [(i,) for i in deleted])
+                self._upsert("content_pages", "key", [
+                    {"key": row["key"], "content": row["content"], "updated_at": row.get("updated_at")}
+                    for row in content
+                ])
+                conn.execute(
+                    "INSERT INTO sync_state (key, value) VALUES ('cursor', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (cursor,)
+                )
+
+    def load(self) -> Tuple[List[Dict], List[Dict], Optional[str]]:
+        """Everything needed to serve without the network: (events, content rows, cursor)."""
+        with self._lock:
+            conn = self._connect()
+            events = [dict(row) for row in conn.execute("SELECT * FROM events ORDER BY id")]
+            content = [dict(row) for row in conn.execute("SELECT key, content FROM content_pages")]
+            row = conn.execute("SELECT value FROM sync_state WHERE key = 'cursor'").fetchone()
+            return events, content, row["value"] if row else None
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
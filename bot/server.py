@@ -0,0 +1,223 @@
+"""
+HTTP server for Brahma 26 Bot
+One asyncio server on $PORT for health checks, metrics, cache invalidation
+and, in webhook mode, incoming Telegram updates.
+"""
+import os
+import hmac
+import logging
+from typing import Optional
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+import metrics
+import registrations
+import telemetry
+from event_store import store
+from api_client import breaker, cache_stats, invalidate_cache
+from breaker import CLOSED, HALF_OPEN, OPEN
+from render import render_cache
+from health import monitor as health_monitor
+
+logger = logging.getLogger(__name__)
+
+# Cache resources dropped for each scope the admin API can invalidate
+INVALIDATION_SCOPES = {
+    "events": ("events", "event", "categories"),
+    "content": ("content",),
+    # Nothing cached; tells the broadcaster to look for new announcements
+    "announcements": ()
+}
+
+WEBHOOK_PATH = "/telegram"
+
+APP_KEY = web.AppKey("application", Application)
+SECRET_KEY = web.AppKey("webhook_secret", str)
+
+async def health(request: web.Request) -> web.Response:
+    """GET / and /health - liveness check (keeps Render awake)."""
+    return web.Response(text="Bot is running!")
+
+async def metrics_text(request: web.Request) -> web.Response:
+    """GET /metrics - latency histograms and counters in the Prometheus text format."""
+    return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8",
+                        headers={"X-Content-Type-Options": "nosniff"})
+
+async def stats(request: web.Request) -> web.Response:
+    """GET /stats - the same counters as JSON, for a quick look without Prometheus."""
+    application = request.app[APP_KEY]
+    return web.json_response({
+        "cache": cache_stats(),
+        "circuit": breaker.stats(),
+        "render_cache": render_cache.stats(),
+        "event_store": store.stats(),
+        "telemetry": telemetry.queue.stats(),
+        "registrations": registrations.queue.stats(),
+        "update_queue": application.update_queue.qsize(),
+        "updates": application.update_processor.stats(),
+        "broadcast": application.bot_data["broadcaster"].stats(),
+        "health": health_monitor.snapshot()
+    })
+
+async def invalidate(request: web.Request) -> web.Response:
+    """POST /invalidate - drop cached data after an admin write."""
+    secret = os.getenv("BOT_SHARED_SECRET", "")
+    provided = request.headers.get("X-Bot-Secret", "")
+    if not secret or not hmac.compare_digest(provided, secret):
+        return web.json_response({"detail": "Unauthorized"}, status=401)
+
+    try:
+        scope = (await request.json()).get("scope")
+    except (ValueError, AttributeError):
+        return web.json_response({"detail": "Invalid JSON"}, status=400)
+
+    if scope not in INVALIDATION_SCOPES:
+        return web.json_response({"detail": f"Unknown scope: {scope}"}, status=400)
+
+    if scope == "announcements":
+        request.app[APP_KEY].bot_data["broadcaster"].request_check()
+    else:
+        invalidate_cache(*INVALIDATION_SCOPES[scope])
+        # The sync feed carries both events and content, so pull it right away
+        store.request_refresh()
+    logger.info(f"♻️ Cache invalidated: {scope}")
+    return web.json_response({"message": "Invalidated", "scope": scope})
+
+async def telegram_webhook(request: web.Request) -> web.Response:
+    """POST /telegram - receive an update pushed by Telegram."""
+    provided = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+    if not hmac.compare_digest(provided, request.app[SECRET_KEY]):
+        return web.Response(status=403)
+
+    application = request.app[APP_KEY]
+    try:
+        update = Update.de_json(await request.json(), application.bot)
+    except ValueError:
+        return web.Response(status=400)
+
+    # Too far behind: refuse so Telegram retries later instead of piling up tasks here
+    processor = application.update_processor
+    if processor.full(application.update_queue.qsize()):
+        processor.rejected += 1
+        return web.Response(status=503)
+
+    # Hand off to the Application and answer Telegram right away
+    await application.update_queue.put(update)
+    return web.Response()
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    return hits / (hits + misses) if hits + misses else None
+
+def register_metrics(application: Application):
+    """Expose the counters each component already keeps as scrape-time metrics.
+
+    Each component's stats() is read once per scrape and shared by its collectors.
+    """
+    @metrics.per_scrape
+    def caches():
+        return {"api": cache_stats(), "render": render_cache.stats()}
+
+    @metrics.per_scrape
+    def broadcaster_stats():
+        broadcaster = application.bot_data.get("broadcaster")
+        return broadcaster.stats() if broadcaster else {}
+
+    store_stats = metrics.per_scrape(store.stats)
+    telemetry_stats = metrics.per_scrape(telemetry.queue.stats)
+    registration_stats = metrics.per_scrape(registrations.queue.stats)
+    update_stats = metrics.per_scrape(lambda: application.update_processor.stats())
+
+    metrics.CounterFunc("bot_cache_lookups_total", "Cache lookups by result", lambda: {
+        (cache, result): values[result]
+        for cache, values in caches().items()
+        for result in ("hits", "misses", "coalesced") if result in values
+    }, ["cache", "result"])
+    metrics.Gauge("bot_cache_hit_ratio", "Share of cache lookups answered without a fetch or render", lambda: {
+        (cache,): _ratio(values["hits"] + values.get("coalesced", 0), values["misses"])
+        for cache, values in caches().items()
+    }, ["cache"])
+    metrics.Gauge("bot_cache_entries", "Entries currently cached", lambda: {
+        (cache,): values["size"] for cache, values in caches().items()
+    }, ["cache"])
+    metrics.CounterFunc("bot_cache_evictions_total", "Entries evicted to stay under the size limit",
+                        lambda: {("api",): caches()["api"]["evictions"]}, ["cache"])
+    metrics.CounterFunc("bot_cache_stale_hits_total", "Expired entries served because the API call failed",
+                        lambda: {("api",): caches()["api"]["stale_hits"]}, ["cache"])
+
+    metrics.Gauge("bot_api_circuit_state", "1 for the API circuit breaker's current state", lambda: {
+        (state,): int(breaker.state == state) for state in (CLOSED, HALF_OPEN, OPEN)
+    }, ["state"])
+    metrics.CounterFunc("bot_api_circuit_opened_total", "Times the API circuit opened",
+                        lambda: {(): breaker.opened})
+    metrics.CounterFunc("bot_api_circuit_rejected_total", "API calls failed fast while the circuit was open",
+                        lambda: {(): breaker.rejected})
+
+    metrics.Gauge("bot_event_store_events", "Events held in memory", lambda: {
+        ("all",): store_stats()["events"], ("active",): store_stats()["active"]
+    }, ["state"])
+    metrics.Gauge("bot_event_store_version", "Bumped whenever synced data changes",
+                  lambda: {(): store_stats()["version"]})
+
+    metrics.Gauge("bot_telemetry_buffered", "Interaction logs waiting to be flushed",
+                  lambda: {(): telemetry_stats()["buffered"]})
+    metrics.CounterFunc("bot_telemetry_logs_total", "Interaction logs by outcome", lambda: {
+        (outcome,): telemetry_stats()[outcome] for outcome in ("sent", "dropped")
+    }, ["outcome"])
+    metrics.CounterFunc("bot_telemetry_failed_flushes_total", "Telemetry flushes that failed",
+                        lambda: {(): telemetry_stats()["failed_flushes"]})
+
+    metrics.Gauge("bot_known_users", "Users the bot knows are registered",
+                  lambda: {(): registration_stats()["known"]})
+    metrics.Gauge("bot_registrations_pending", "Registrations waiting to be written",
+                  lambda: {(): registration_stats()["pending"]})
+    metrics.CounterFunc("bot_registrations_total", "/start registrations by outcome", lambda: {
+        (outcome,): registration_stats()[outcome] for outcome in ("written", "skipped", "dropped")
+    }, ["outcome"])
+    metrics.CounterFunc("bot_registration_failed_flushes_total", "Registration writes that failed",
+                        lambda: {(): registration_stats()["failed_flushes"]})
+
+    metrics.Gauge("bot_update_queue", "Updates received but not yet picked up",
+                  lambda: {(): application.update_queue.qsize()})
+    metrics.Gauge("bot_updates_in_flight", "Updates waiting for their chat or being handled", lambda: {
+        (state,): update_stats()[state] for state in ("waiting", "active")
+    }, ["state"])
+    metrics.CounterFunc("bot_updates_processed_total", "Updates handled",
+                        lambda: {(): update_stats()["processed"]})
+    metrics.CounterFunc("bot_updates_rejected_total", "Webhook updates refused because too many were pending",
+                        lambda: {(): update_stats()["rejected"]})
+    metrics.Gauge("bot_update_wait_max_seconds", "Longest an update has waited behind its chat",
+                  lambda: {(): update_stats()["max_wait"]})
+
+    metrics.CounterFunc("bot_broadcast_messages_total", "Broadcast messages by outcome", lambda: {
+        (outcome,): value for outcome, value in broadcaster_stats().items()
+        if outcome in ("delivered", "failed", "retried")
+    }, ["outcome"])
+    metrics.Gauge("bot_broadcast_queued", "Announcements queued per lane", lambda: {
+        (lane,): values["queued"] for lane, values in broadcaster_stats().get("lanes", {}).items()
+    }, ["lane"])
+    metrics.Gauge("bot_broadcast_scheduled", "Announcements waiting for their send time",
+                  lambda: {(): len(broadcaster_stats().get("scheduled", {}))})
+    metrics.Gauge("bot_broadcast_latency_seconds", "Time from an announcement being due (created or scheduled) to delivery, recent sends", lambda: {
+        (lane, quantile): values[f"latency_p{quantile[2:]}"]
+        for lane, values in broadcaster_stats().get("lanes", {}).items()
+        for quantile in ("0.50", "0.99")
+    }, ["lane", "quantile"])
+
+def create_web_app(application: Application, webhook_secret: Optional[str] = None) -> web.Application:
+    """Build the aiohttp app. The Telegram route is only added when a webhook secret is given."""
+    web_app = web.Application()
+    web_app[APP_KEY] = application
+    register_metrics(application)
+    web_app.router.add_get("/", health)
+    web_app.router.add_get("/health", health)
+    web_app.router.add_get("/metrics", metrics_text)
+    web_app.router.add_get("/stats", stats)
+    web_app.router.add_post("/invalidate", invalidate)
+
+    if webhook_secret:
+        web_app[SECRET_KEY] = webhook_secret
+        web_app.router.add_post(WEBHOOK_PATH, telegram_webhook)
+
+    return web_app
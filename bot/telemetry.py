@@ -0,0 +1,134 @@
+"""
+Telemetry queue for Brahma 26 Bot
+Buffers interaction events in memory and sends them to the API in bulk.
+"""
+import os
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from api_client import bot_headers, get_client
+
+logger = logging.getLogger(__name__)
+
+class TelemetryQueue:
+    """Bounded buffer flushed to /api/telemetry/batch by size or by time.
+
+    log() never blocks or awaits; when the buffer is full new events are dropped
+    and counted rather than slowing down handlers.
+    """
+
+    def __init__(self, max_buffer: int = 5000, batch_size: int = 100, flush_interval: float = 5.0):
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+        # Off when the API can't accept bot calls (no BOT_SHARED_SECRET)
+        self.enabled = True
+
+    def log(self, telegram_id: int, action: str, metadata: Optional[str] = None) -> bool:
+        """Queue an interaction. Returns False if it was dropped."""
+        if not self.enabled:
+            return False
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return False
+
+        self._buffer.append({
+            "telegram_id": telegram_id,
+            "action": action,
+            "metadata": metadata,
+            # Same format as SQLite's datetime('now')
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        })
+        if self._wakeup and len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def start(self):
+        """Start the background flush loop (call from the running event loop)."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and send whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Send buffered events in batches until the buffer is empty or a send fails."""
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            try:
+                ok = await self._send(batch)
+            except asyncio.CancelledError:
+                self._requeue(batch)
+                raise
+            if not ok:
+                self._requeue(batch)
+                return
+
+    async def _send(self, batch: List[Dict]) -> bool:
+        try:
+            r = await get_client().post(
+                "/api/telemetry/batch",
+                json={"events": batch},
+                headers=bot_headers(),
+                timeout=5
+            )
+            r.raise_for_status()
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.warning(f"Telemetry flush failed ({len(batch)} events): {e}")
+            return False
+        self.sent += len(batch)
+        return True
+
+    def _requeue(self, batch: List[Dict]):
+        """Put a failed batch back at the front, dropping what no longer fits."""
+        room = self.max_buffer - len(self._buffer)
+        keep = batch[:max(room, 0)]
+        self.dropped += len(batch) - len(keep)
+        self._buffer.extendleft(reversed(keep))
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and delivery counters."""
+        return {
+            "buffered": len(self._buffer),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes
+        }
+
+queue = TelemetryQueue(
+    max_buffer=int(os.getenv("TELEMETRY_BUFFER_SIZE", 5000)),
+    batch_size=int(os.getenv("TELEMETRY_BATCH_SIZE", 100)),
+    flush_interval=float(os.getenv("TELEMETRY_FLUSH_INTERVAL", 5))
+)
+
+def log_interaction(telegram_id: int, action: str, metadata: Optional[str] = None):
+    """Log user interaction (queued, sent in the background)."""
+    queue.log(telegram_id, action, metadata)
@@ -0,0 +1,105 @@
+"""
+Update processor for Brahma 26 Bot
+Runs updates concurrently while keeping each chat's updates in order.
+"""
+import time
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Process up to `workers` updates at once, one at a time per chat.
+
+    Updates from the same chat wait on a per-chat lock before taking a worker slot,
+    so a user's rapid double taps run in arrival order without holding extra slots.
+
+    PTB creates a task for every update before it gets here, so this can't bound
+    memory by itself. The webhook intake checks full() and turns updates away (Telegram
+    redelivers them later) once `max_pending` are queued, waiting or running.
+    """
+
+    def __init__(self, workers: int, max_pending: int = 4096):
+        super().__init__(max(max_pending, workers))
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(workers)
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_users: Dict[int, int] = {}
+        self.waiting = 0
+        self.active = 0
+        self.processed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.rejected = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    @staticmethod
+    def _chat_id(update: object) -> Optional[int]:
+        if isinstance(update, Update):
+            if update.effective_chat:
+                return update.effective_chat.id
+            if update.effective_user:
+                return update.effective_user.id
+        return None
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        chat_id = self._chat_id(update)
+        queued_at = time.monotonic()
+        self.waiting += 1
+
+        lock = None
+        if chat_id is not None:
+            lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+            self._chat_users[chat_id] = self._chat_users.get(chat_id, 0) + 1
+
+        started = False
+        try:
+            if lock:
+                await lock.acquire()
+            try:
+                async with self._slots:
+                    started = True
+                    waited = time.monotonic() - queued_at
+                    self.waiting -= 1
+                    self.active += 1
+                    self.total_wait += waited
+                    self.max_wait = max(self.max_wait, waited)
+                    try:
+                        await coroutine
+                    finally:
+                        self.active -= 1
+                        self.processed += 1
+            finally:
+                if lock:
+                    lock.release()
+        finally:
+            if not started:
+                self.waiting -= 1
+            if chat_id is not None:
+                self._chat_users[chat_id] -= 1
+                if not self._chat_users[chat_id]:
+                    del self._chat_users[chat_id]
+                    del self._chat_locks[chat_id]
+
+    def full(self, queued: int = 0) -> bool:
+        """Whether `queued` updates not picked up yet plus those waiting or running reach max_pending."""
+        return queued + self.waiting + self.active >= self.max_pending
+
+    def stats(self) -> Dict[str, float]:
+        """Backpressure metrics: queue depth, workers in use and wait times (seconds)."""
+        return {
+            "workers": self.workers,
+            "waiting": self.waiting,
+            "active": self.active,
+            "processed": self.processed,
+            "avg_wait": self.total_wait / self.processed if self.processed else 0.0,
+            "max_wait": self.max_wait,
+            "rejected": self.rejected
+        }
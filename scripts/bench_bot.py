@@ -0,0 +1,349 @@
+"""
+Load test and latency benchmark for the Brahma 26 bot
+Drives the real Application and handlers with synthetic updates against a fake
+Telegram Bot API and a stub of the admin /api routes with configurable latency.
+The fakes run in a child process so they don't compete with the bot's event loop.
+Nothing leaves the machine.
+
+Reports handler latency (p50/p95/p99 per handler), end-to-end latency from enqueue
+to handler finish, updates/s and event-loop blocking.
+
+Usage (with the bot's requirements installed):
+    python bench_bot.py --updates 5000 --users 500 --api-latency 40 --tg-latency 30
+    python bench_bot.py --max-p99 250     # exit 1 if end-to-end p99 exceeds 250 ms
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import multiprocessing
+from collections import defaultdict
+
+from aiohttp import ClientSession, web
+from telegram import Update
+
+BOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot")
+TOKEN = "123456:BENCHMARK"
+
+# Callback data weighted roughly like real traffic: menus and event pages dominate
+MIX = [
+    ("start", 5),
+    ("menu_events", 15),
+    ("cat_Technical", 10),
+    ("cat_Cultural", 10),
+    ("events_all_n{event}", 5),
+    ("event_{event}", 25),
+    ("menu_timeline", 10),
+    ("menu_contact", 5),
+    ("menu_results", 5),
+    ("menu_status", 5),
+    ("menu_back", 5),
+]
+
+def percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+async def delay(base_ms: float, jitter: float):
+    if base_ms > 0:
+        await asyncio.sleep(base_ms * random.uniform(1 - jitter, 1 + jitter) / 1000)
+
+# --- Stub admin API ---
+
+def fake_events(count: int):
+    categories = ["Technical", "Cultural", "General"]
+    return [{
+        "id": i,
+        "name": f"Event {i}",
+        "category": categories[i % 3],
+        "description": "Benchmark event " * 5,
+        "venue": f"Hall {i % 7}",
+        "start_time": f"2026-01-{25 + i % 3} {8 + i % 12:02d}:00",
+        "end_time": f"2026-01-{25 + i % 3} {9 + i % 12:02d}:00",
+        "rules": "Be nice",
+        "is_active": 1,
+        "results": "1st: Team A" if i % 10 == 0 else None,
+        "poster_file_id": None,
+        "updated_at": "2026-01-01 00:00:00"
+    } for i in range(1, count + 1)]
+
+def create_api(events, latency_ms: float, jitter: float, counts) -> web.Application:
+    by_id = {e["id"]: e for e in events}
+    content = {"faq": "[]", "emergency_contacts": json.dumps([{"name": "Control Room", "phone": "+91 00000 00000"}]),
+               "about": "Brahma 26"}
+
+    @web.middleware
+    async def slow(request, handler):
+        if request.path == "/_counts":
+            return await handler(request)
+        counts[request.path.split("/")[2] if request.path.count("/") > 1 else request.path] += 1
+        await delay(latency_ms, jitter)
+        return await handler(request)
+
+    async def events_list(request):
+        category = request.query.get("category")
+        return web.json_response([e for e in events if not category or e["category"] == category])
+
+    async def event(request):
+        found = by_id.get(int(request.match_info["id"]))
+        return web.json_response(found) if found else web.json_response({"detail": "Not found"}, status=404)
+
+    async def sync(request):
+        return web.json_response({
+            "cursor": "2026-01-01 00:00:00", "full": "since" not in request.query,
+            "events": [] if "since" in request.query else events, "deleted": [],
+            "content": [{"key": k, "content": v} for k, v in content.items()]
+        })
+
+    async def content_page(request):
+        key = request.query.get("key")
+        return web.json_response({"key": key, "content": content.get(key, "")})
+
+    async def ok(request):
+        return web.json_response({"message": "ok"})
+
+    async def empty(request):
+        return web.json_response([])
+
+    async def stats(request):
+        return web.json_response(counts)
+
+    app = web.Application(middlewares=[slow])
+    app.router.add_get("/_counts", stats)
+    app.router.add_get("/api/events", events_list)
+    app.router.add_get("/api/events/categories", lambda r: web.json_response(["Technical", "Cultural", "General"]))
+    app.router.add_get("/api/events/{id:\\d+}", event)
+    app.router.add_get("/api/sync", sync)
+    app.router.add_get("/api/content", content_page)
+    app.router.add_get("/api/health", lambda r: web.json_response({"status": "ok", "database": "connected"}))
+    app.router.add_get("/api/announcements", empty)
+    app.router.add_get("/api/users/recipients", empty)
+    app.router.add_post("/api/auth/register-bot-users", ok)
+    app.router.add_post("/api/health/heartbeat", ok)
+    app.router.add_post("/api/telemetry/batch", ok)
+    return app
+
+# --- Fake Telegram Bot API ---
+
+def create_telegram(latency_ms: float, jitter: float, counts) -> web.Application:
+    message_ids = iter(range(1_000_000, 10_000_000))
+
+    def message(chat_id, text=""):
+        return {"message_id": next(message_ids), "date": int(time.time()), "text": text,
+                "chat": {"id": int(chat_id), "type": "private"}}
+
+    async def method(request):
+        name = request.match_info["method"]
+        counts[name] += 1
+        params = dict(await request.post())
+        await delay(latency_ms, jitter)
+        if name == "getMe":
+            result = {"id": 123456, "is_bot": True, "first_name": "Bench", "username": "bench_bot",
+                      "can_join_groups": False, "can_read_all_group_messages": False,
+                      "supports_inline_queries": False}
+        elif name in ("sendMessage", "sendPhoto", "editMessageText"):
+            result = message(params.get("chat_id", 0), params.get("text", ""))
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def stats(request):
+        return web.json_response(counts)
+
+    app = web.Application()
+    app.router.add_get("/_counts", stats)
+    app.router.add_post("/bot{token}/{method}", method)
+    return app
+
+async def serve(app: web.Application) -> tuple:
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+def run_fakes(args, conn):
+    """Child process: serve both fakes and report their base URLs back to the parent."""
+    async def main():
+        events = fake_events(args.events)
+        _, api_url = await serve(create_api(events, args.api_latency, args.jitter, defaultdict(int)))
+        _, tg_url = await serve(create_telegram(args.tg_latency, args.jitter, defaultdict(int)))
+        conn.send((api_url, tg_url))
+        await asyncio.Event().wait()
+    asyncio.run(main())
+
+async def fetch_counts(url: str) -> dict:
+    async with ClientSession() as session:
+        async with session.get(f"{url}/_counts") as response:
+            return await response.json()
+
+# --- Synthetic updates ---
+
+def make_update(update_id: int, chat_id: int, action: str, event_count: int) -> dict:
+    user = {"id": chat_id, "is_bot": False, "first_name": f"User{chat_id}", "username": f"user{chat_id}"}
+    chat = {"id": chat_id, "type": "private"}
+    if action == "start":
+        return {"update_id": update_id, "message": {
+            "message_id": update_id, "date": int(time.time()), "chat": chat, "from": user, "text": "/start",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 6}]
+        }}
+    return {"update_id": update_id, "callback_query": {
+        "id": str(update_id), "from": user, "chat_instance": str(chat_id),
+        "data": action.format(event=random.randint(1, event_count)),
+        "message": {"message_id": update_id, "date": int(time.time()), "chat": chat, "text": "menu"}
+    }}
+
+# --- Event loop monitor ---
+
+async def monitor_loop(samples: list, interval: float = 0.005):
+    """Record how late each wakeup is; lateness means something blocked the loop."""
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(time.perf_counter() - expected, 0.0))
+
+# --- Benchmark ---
+
+async def run(args) -> int:
+    random.seed(args.seed)
+    parent, child = multiprocessing.Pipe()
+    fakes = multiprocessing.Process(target=run_fakes, args=(args, child), daemon=True)
+    fakes.start()
+    api_url, tg_url = parent.recv()
+
+    # Configure the bot before importing it (modules read the environment at import)
+    os.environ.update({
+        "API_BASE_URL": api_url,
+        "BOT_REPLICA_PATH": "",
+        "BOT_CONCURRENT_UPDATES": str(args.concurrency),
+        # The fakes accept any secret; without one registrations and telemetry are off
+        "BOT_SHARED_SECRET": "bench",
+    })
+    sys.path.insert(0, BOT_DIR)
+    import main as bot_main
+
+    app = bot_main.build_application(TOKEN, webhook=True, base_url=f"{tg_url}/bot")
+
+    handler_times = defaultdict(list)
+    end_to_end = []
+    enqueued = {}
+    done = asyncio.Event()
+    finished = 0
+
+    def timed(callback):
+        async def wrapper(update, context):
+            nonlocal finished
+            started = time.perf_counter()
+            try:
+                return await callback(update, context)
+            finally:
+                now = time.perf_counter()
+                handler_times[callback.__name__].append(now - started)
+                end_to_end.append(now - enqueued.pop(update.update_id))
+                finished += 1
+                if finished == args.updates:
+                    done.set()
+        return wrapper
+
+    for group in app.handlers.values():
+        for handler in group:
+            handler.callback = timed(handler.callback)
+
+    lag = []
+    async with app:
+        await bot_main.on_startup(app)
+        await app.start()
+        await bot_main.store.ensure_loaded()
+
+        updates = []
+        actions, weights = zip(*MIX)
+        for update_id in range(1, args.updates + 1):
+            chat_id = random.randint(1, args.users)
+            action = random.choices(actions, weights)[0]
+            updates.append(make_update(update_id, chat_id, action, args.events))
+
+        monitor = asyncio.create_task(monitor_loop(lag))
+        started = time.perf_counter()
+        for data in updates:
+            update = Update.de_json(data, app.bot)
+            enqueued[update.update_id] = time.perf_counter()
+            await app.update_queue.put(update)
+            if args.rate:
+                await asyncio.sleep(1 / args.rate)
+        try:
+            await asyncio.wait_for(done.wait(), timeout=args.timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Timed out: {finished}/{args.updates} updates handled")
+        elapsed = time.perf_counter() - started
+        monitor.cancel()
+
+        await app.stop()
+        await bot_main.on_shutdown(app)
+
+    api_counts, tg_counts = await fetch_counts(api_url), await fetch_counts(tg_url)
+    fakes.terminate()
+
+    ms = lambda seconds: round(seconds * 1000, 1)
+    report = {
+        "updates": finished,
+        "seconds": round(elapsed, 2),
+        "updates_per_second": round(finished / elapsed, 1) if elapsed else 0,
+        "end_to_end_ms": {q: ms(percentile(end_to_end, p)) for q, p in (("p50", .5), ("p95", .95), ("p99", .99))},
+        "handlers_ms": {
+            name: {"count": len(times), **{q: ms(percentile(times, p)) for q, p in (("p50", .5), ("p95", .95), ("p99", .99))}}
+            for name, times in sorted(handler_times.items())
+        },
+        "event_loop_lag_ms": {"p99": ms(percentile(lag, .99)), "max": ms(max(lag, default=0)),
+                              # Time the loop spent stuck in callbacks for more than 10 ms
+                              "blocked_total": ms(sum(l for l in lag if l > 0.010))},
+        "api_calls": dict(api_counts),
+        "telegram_calls": dict(tg_counts)
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n📊 {report['updates']} updates in {report['seconds']}s "
+              f"({report['updates_per_second']} updates/s, concurrency {args.concurrency})")
+        e2e = report["end_to_end_ms"]
+        print(f"   End to end: p50 {e2e['p50']} ms, p95 {e2e['p95']} ms, p99 {e2e['p99']} ms")
+        print(f"   {'Handler':<24}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for name, h in report["handlers_ms"].items():
+            print(f"   {name:<24}{h['count']:>7}{h['p50']:>9}{h['p95']:>9}{h['p99']:>9}")
+        loop_lag = report["event_loop_lag_ms"]
+        print(f"   Event loop lag: p99 {loop_lag['p99']} ms, max {loop_lag['max']} ms, "
+              f"blocked {loop_lag['blocked_total']} ms")
+        print(f"   API calls: {report['api_calls']}")
+        print(f"   Telegram calls: {report['telegram_calls']}")
+
+    if finished < args.updates:
+        return 1
+    if args.max_p99 and report["end_to_end_ms"]["p99"] > args.max_p99:
+        print(f"❌ p99 {report['end_to_end_ms']['p99']} ms exceeds --max-p99 {args.max_p99} ms")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bot's handlers against fake Telegram/API servers")
+    parser.add_argument("--updates", type=int, default=5000, help="synthetic updates to send")
+    parser.add_argument("--users", type=int, default=500, help="distinct chats the updates come from")
+    parser.add_argument("--events", type=int, default=200, help="events served by the stub API")
+    parser.add_argument("--api-latency", type=float, default=40, help="stub /api latency in ms")
+    parser.add_argument("--tg-latency", type=float, default=30, help="fake Telegram API latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.5, help="latency jitter as a fraction (0.5 = +/-50%%)")
+    parser.add_argument("--concurrency", type=int, default=16, help="BOT_CONCURRENT_UPDATES for the run")
+    parser.add_argument("--rate", type=float, default=0, help="updates/s to send at (0 = as fast as possible)")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for all updates")
+    parser.add_argument("--seed", type=int, default=26, help="random seed for a reproducible update mix")
+    parser.add_argument("--max-p99", type=float, default=0, help="fail if end-to-end p99 exceeds this many ms")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+if __name__ == "__main__":
+    main()
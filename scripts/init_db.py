@@ -1,40 +1,17 @@
 """
 Database initialization script for Brahma 26
-Executes each statement separately for reliability.
+Connects with turso_db.connect() and sends the whole schema as one batch (a single
+pipeline request) with atomic=False, so each statement still succeeds or fails on
+its own and failures are listed per statement.
 """
-import os
-import requests
-from dotenv import load_dotenv
-
-# Load from parent directory .env
-load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
-
-def execute_sql(url: str, auth_token: str, sql: str):
-    """Execute SQL via Turso HTTP API."""
-    if url.startswith("libsql://"):
-        url = url.replace("libsql://", "https://")
-    
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json"
-    }
-    
-    payload = {
-        "requests": [
-            {"type": "execute", "stmt": {"sql": sql}},
-            {"type": "close"}
-        ]
-    }
-    
-    response = requests.post(f"{url}/v2/pipeline", headers=headers, json=payload)
-    return response.json()
+from turso_db import TursoError, connect
+from rollup_telemetry import ROLLUP_TABLES
 
 def init_database():
-    """Initialize database with schema - execute statements individually."""
-    url = os.getenv("TURSO_DATABASE_URL")
-    auth_token = os.getenv("TURSO_AUTH_TOKEN")
-    
-    if not url or not auth_token:
+    """Initialize database with schema in one batch request."""
+    try:
+        client = connect()
+    except ValueError:
         print("❌ Error: TURSO_DATABASE_URL and TURSO_AUTH_TOKEN must be set in .env")
         return False
     
@@ -64,7 +41,17 @@ def init_database():
             poster_caption TEXT,
             hashtags TEXT,
             volunteer_contacts TEXT,
-            created_at TEXT DEFAULT (datetime('now'))
+            created_at TEXT DEFAULT (datetime('now')),
+            updated_at TEXT DEFAULT (datetime('now'))
+        )""",
+        """CREATE TABLE IF NOT EXISTS event_tombstones (
+            event_id INTEGER PRIMARY KEY,
+            deleted_at TEXT DEFAULT (datetime('now'))
+        )""",
+        """CREATE TABLE IF NOT EXISTS bot_heartbeat (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            report TEXT NOT NULL,
+            received_at TEXT DEFAULT (datetime('now'))
         )""",
         """CREATE TABLE IF NOT EXISTS announcements (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,6 +60,8 @@ def init_database():
             priority TEXT DEFAULT 'normal',
             scheduled_at TEXT,
             sent_at TEXT,
+            delivery_cursor INTEGER DEFAULT 0,
+            delivered_count INTEGER DEFAULT 0,
             created_at TEXT DEFAULT (datetime('now'))
         )""",
         """CREATE TABLE IF NOT EXISTS telemetry (
@@ -97,35 +86,39 @@ def init_database():
         )""",
         # Indexes
         "CREATE INDEX IF NOT EXISTS idx_events_category ON events(category)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_events_name ON events(name)",
         "CREATE INDEX IF NOT EXISTS idx_events_active ON events(is_active)",
+        "CREATE INDEX IF NOT EXISTS idx_events_updated ON events(updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_time, id)",
+        "CREATE INDEX IF NOT EXISTS idx_content_updated ON content_pages(updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tombstones_deleted ON event_tombstones(deleted_at)",
+        "CREATE INDEX IF NOT EXISTS idx_announcements_pending ON announcements(sent_at)",
         "CREATE INDEX IF NOT EXISTS idx_telemetry_user ON telemetry(user_id)",
-        "CREATE INDEX IF NOT EXISTS idx_telemetry_action ON telemetry(action)"
+        "CREATE INDEX IF NOT EXISTS idx_telemetry_action ON telemetry(action)",
+        # Dashboard rollups, maintained by rollup_telemetry.py
+        *ROLLUP_TABLES
     ]
     
-    for i, sql in enumerate(statements):
+    with client:
         try:
-            result = execute_sql(url, auth_token, sql)
-            results = result.get("results", [])
-            if results and results[0].get("type") == "ok":
-                print(f"   ✓ Statement {i+1}/{len(statements)} OK")
-            else:
-                error = results[0].get("error", {}) if results else {}
-                print(f"   ⚠ Statement {i+1}: {error.get('message', 'unknown error')}")
+            results = client.batch(statements, atomic=False)
         except Exception as e:
-            print(f"   ❌ Statement {i+1}: {e}")
-    
-    print("\n✅ Schema initialization complete!")
-    
-    # Verify tables
-    result = execute_sql(url, auth_token, "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-    results = result.get("results", [])
-    if results and results[0].get("type") == "ok":
-        rows = results[0].get("response", {}).get("result", {}).get("rows", [])
-        tables = [row[0]["value"] for row in rows if row]
+            print(f"   ❌ Could not reach the database: {e}")
+            return False
+
+        for i, result in enumerate(results):
+            if isinstance(result, TursoError):
+                print(f"   ⚠ Statement {i+1}: {result}")
+            else:
+                print(f"   ✓ Statement {i+1}/{len(statements)} OK")
+        
+        print("\n✅ Schema initialization complete!")
+        
+        # Verify tables
+        result = client.query("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+        tables = [row.name for row in result]
         print(f"📋 Tables created: {', '.join(tables)}")
         return True
-    
-    return False
 
 if __name__ == "__main__":
     init_database()
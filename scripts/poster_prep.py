@@ -0,0 +1,118 @@
+"""
+Poster preprocessing for Brahma 26
+Shrinks posters to what Telegram actually displays and flags look-alikes before upload.
+
+Used by upload_posters.py; prepare_posters() spreads the work over a process pool.
+"""
+import os
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    print("❌ Please install Pillow: pip install Pillow")
+    exit(1)
+
+# Telegram shows photos at most 1280px on the long side and recompresses anything bigger
+MAX_SIDE = int(os.getenv("POSTER_MAX_SIDE", 1280))
+MAX_BYTES = int(os.getenv("POSTER_MAX_BYTES", 350_000))
+# Report posters whose perceptual hashes differ in at most this many bits as possible
+# duplicates (0 = off). Only reported: posters from one template hash alike, so uploads
+# are shared on identical files alone.
+NEAR_DUPLICATE_DISTANCE = int(os.getenv("POSTER_NEAR_DUPLICATE_DISTANCE", 0))
+
+class PreparedPoster(NamedTuple):
+    source: str
+    path: str
+    dhash: int
+    original_bytes: int
+    prepared_bytes: int
+
+def dhash(image: Image.Image, size: int = 8) -> int:
+    """64-bit difference hash: survives resizing and recompression of the same artwork."""
+    small = image.convert("L").resize((size + 1, size), Image.LANCZOS)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def _encode(image: Image.Image, max_bytes: int) -> bytes:
+    """JPEG at the highest quality that fits max_bytes (or the lowest tried)."""
+    for quality in (90, 85, 80, 75, 70, 60, 50):
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+        if buffer.tell() <= max_bytes:
+            break
+    return buffer.getvalue()
+
+def prepare_poster(source: str, out_dir: str, name: str) -> PreparedPoster:
+    """Resize and recompress one poster into out_dir. Runs in a worker process.
+
+    Small JPEGs that already fit are kept as-is to avoid a second round of compression.
+    """
+    original_bytes = os.path.getsize(source)
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        fingerprint = dhash(image)
+        fits = max(image.size) <= MAX_SIDE and original_bytes <= MAX_BYTES
+        if fits and opened.format == "JPEG":
+            return PreparedPoster(source, source, fingerprint, original_bytes, original_bytes)
+
+        if image.mode in ("RGBA", "LA", "P"):
+            # JPEG has no alpha: flatten onto white like Telegram does
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        else:
+            image = image.convert("RGB")
+        image.thumbnail((MAX_SIDE, MAX_SIDE), Image.LANCZOS)
+        data = _encode(image, MAX_BYTES)
+
+    path = os.path.join(out_dir, name + ".jpg")
+    with open(path, "wb") as f:
+        f.write(data)
+    return PreparedPoster(source, path, fingerprint, original_bytes, len(data))
+
+def prepare_posters(sources: Dict[str, str], out_dir: str,
+                    workers: Optional[int] = None) -> Dict[str, PreparedPoster]:
+    """Prepare many posters in parallel. sources maps a key (e.g. content hash) to a file path.
+
+    Files that can't be read or converted are reported and left out of the result.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    prepared = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {key: pool.submit(prepare_poster, path, out_dir, key) for key, path in sources.items()}
+        for key, future in futures.items():
+            try:
+                prepared[key] = future.result()
+            except Exception as e:
+                print(f"   ❌ Skipping {sources[key]}: {e}")
+    return prepared
+
+def find_near_duplicate(fingerprint: int, known: Dict[int, str]) -> Optional[str]:
+    """The value of the first known fingerprint within NEAR_DUPLICATE_DISTANCE bits, if enabled."""
+    if NEAR_DUPLICATE_DISTANCE <= 0:
+        return None
+    for other, value in known.items():
+        if hamming(fingerprint, other) <= NEAR_DUPLICATE_DISTANCE:
+            return value
+    return None
+
+def savings(prepared: List[PreparedPoster]) -> str:
+    """One-line summary of bytes saved."""
+    before = sum(p.original_bytes for p in prepared)
+    after = sum(p.prepared_bytes for p in prepared)
+    if not before:
+        return "nothing to prepare"
+    return f"{before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({100 - 100 * after / before:.0f}% smaller)"
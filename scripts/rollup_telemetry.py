@@ -0,0 +1,179 @@
+"""
+Telemetry rollups for Brahma 26
+Folds new telemetry rows into hourly and daily summary tables, so the admin dashboard
+(/api/telemetry/stats) reads a few hundred pre-aggregated rows instead of scanning
+the whole telemetry table.
+
+Incremental: telemetry ids above the saved watermark are aggregated in chunks, and
+each chunk is added to the rollups together with the new watermark in one transaction,
+so a crash or rerun never counts a row twice. Buckets are in fest-local time
+(FEST_TIMEZONE, default Asia/Kolkata).
+
+Usage:
+    python rollup_telemetry.py              # catch up once (run from cron every few minutes)
+    python rollup_telemetry.py --watch 300  # keep running, catching up every 300s
+    python rollup_telemetry.py --rebuild    # drop the rollups and recount from the start
+"""
+import os
+import sys
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from turso_db import get_client
+
+FEST_TZ = ZoneInfo(os.getenv("FEST_TIMEZONE", "Asia/Kolkata"))
+
+# Telemetry ids aggregated per transaction
+CHUNK_SIZE = int(os.getenv("ROLLUP_CHUNK_SIZE", 50000))
+
+# Actions whose metadata is the event name (PRD §7.5 event popularity)
+EVENT_ACTIONS = ("view_event",)
+
+ROLLUP_TABLES = [
+    # Bucket starts are fest-local 'YYYY-MM-DD HH:00:00' / 'YYYY-MM-DD'; event is '' for
+    # actions that aren't about an event
+    """CREATE TABLE IF NOT EXISTS telemetry_hourly (
+        hour TEXT NOT NULL,
+        action TEXT NOT NULL,
+        event TEXT NOT NULL DEFAULT '',
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (hour, action, event)
+    )""",
+    """CREATE TABLE IF NOT EXISTS telemetry_daily (
+        day TEXT NOT NULL,
+        action TEXT NOT NULL,
+        event TEXT NOT NULL DEFAULT '',
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, action, event)
+    )""",
+    # Who was active on which day; DAU is kept in telemetry_dau so reads don't count these
+    """CREATE TABLE IF NOT EXISTS telemetry_daily_users (
+        day TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        PRIMARY KEY (day, user_id)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS telemetry_dau (
+        day TEXT PRIMARY KEY,
+        users INTEGER NOT NULL DEFAULT 0
+    )""",
+    # watermark (last telemetry id rolled up), interactions, users, utc_offset_minutes, updated_at
+    """CREATE TABLE IF NOT EXISTS telemetry_rollup_state (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_telemetry_daily_action ON telemetry_daily(action, day)"
+]
+
+def _event_expr() -> str:
+    actions = ", ".join(f"'{action}'" for action in EVENT_ACTIONS)
+    return f"CASE WHEN action IN ({actions}) THEN COALESCE(metadata, '') ELSE '' END"
+
+def _set_state(key: str, value_sql: str, params=None):
+    return (
+        f"INSERT INTO telemetry_rollup_state (key, value) VALUES ('{key}', {value_sql}) "
+        f"ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        params or []
+    )
+
+def chunk_statements(low: int, high: int, offset: str):
+    """Statements that add telemetry rows with low < id <= high to every rollup."""
+    rows = "FROM telemetry WHERE id > ? AND id <= ?"
+    event = _event_expr()
+    return [
+        (f"""INSERT INTO telemetry_hourly (hour, action, event, count)
+             SELECT strftime('%Y-%m-%d %H:00:00', created_at, ?), action, {event}, COUNT(*) {rows}
+             GROUP BY 1, 2, 3
+             ON CONFLICT(hour, action, event) DO UPDATE SET count = count + excluded.count""",
+         [offset, low, high]),
+        (f"""INSERT INTO telemetry_daily (day, action, event, count)
+             SELECT date(created_at, ?), action, {event}, COUNT(*) {rows}
+             GROUP BY 1, 2, 3
+             ON CONFLICT(day, action, event) DO UPDATE SET count = count + excluded.count""",
+         [offset, low, high]),
+        (f"""INSERT OR IGNORE INTO telemetry_daily_users (day, user_id)
+             SELECT DISTINCT date(created_at, ?), user_id {rows} AND user_id IS NOT NULL""",
+         [offset, low, high]),
+        # Recount only the days this chunk touched
+        (f"""INSERT INTO telemetry_dau (day, users)
+             SELECT day, COUNT(*) FROM telemetry_daily_users
+             WHERE day IN (SELECT DISTINCT date(created_at, ?) {rows})
+             GROUP BY day
+             ON CONFLICT(day) DO UPDATE SET users = excluded.users""",
+         [offset, low, high]),
+        (f"""INSERT INTO telemetry_rollup_state (key, value)
+             SELECT 'interactions', COUNT(*) {rows}
+             ON CONFLICT(key) DO UPDATE SET value = value + excluded.value""",
+         [low, high]),
+        _set_state("watermark", "?", [high])
+    ]
+
+def utc_offset() -> int:
+    """Current offset of the fest time zone from UTC, in minutes."""
+    return int(datetime.now(FEST_TZ).utcoffset().total_seconds() // 60)
+
+def rollup(client, chunk_size: int = CHUNK_SIZE) -> int:
+    """Roll up every telemetry row above the watermark. Returns the number of ids covered."""
+    minutes = utc_offset()
+    offset = f"{minutes:+d} minutes"
+
+    row = client.query("SELECT value FROM telemetry_rollup_state WHERE key = 'watermark'").first()
+    watermark = row.value if row else 0
+    latest = client.query("SELECT COALESCE(MAX(id), 0) AS id FROM telemetry").first().id
+
+    covered = 0
+    while watermark < latest:
+        high = min(watermark + chunk_size, latest)
+        started = time.monotonic()
+        client.batch(chunk_statements(watermark, high, offset))
+        covered += high - watermark
+        print(f"   ✓ ids {watermark + 1}-{high} ({time.monotonic() - started:.1f}s)")
+        watermark = high
+
+    # Small totals the dashboard would otherwise COUNT(*) on every load
+    client.batch([
+        _set_state("users", "(SELECT COUNT(*) FROM users)"),
+        _set_state("utc_offset_minutes", "?", [minutes]),
+        _set_state("updated_at", "CAST(strftime('%s', 'now') AS INTEGER)")
+    ])
+    return covered
+
+def rebuild(client):
+    """Empty the rollups and the watermark so the next run recounts everything."""
+    client.batch([
+        "DELETE FROM telemetry_hourly",
+        "DELETE FROM telemetry_daily",
+        "DELETE FROM telemetry_daily_users",
+        "DELETE FROM telemetry_dau",
+        "DELETE FROM telemetry_rollup_state"
+    ])
+    print("🧹 Rollups cleared")
+
+def main():
+    client = get_client()
+    client.batch(ROLLUP_TABLES)
+
+    if "--rebuild" in sys.argv:
+        rebuild(client)
+
+    interval = None
+    if "--watch" in sys.argv:
+        position = sys.argv.index("--watch")
+        interval = float(sys.argv[position + 1]) if len(sys.argv) > position + 1 else 300
+
+    while True:
+        started = time.monotonic()
+        try:
+            covered = rollup(client)
+        except Exception as e:
+            print(f"❌ Rollup failed (the watermark only moves with committed chunks): {e}")
+            if interval is None:
+                sys.exit(1)
+        else:
+            print(f"✅ Rolled up {covered} telemetry ids in {time.monotonic() - started:.1f}s")
+        if interval is None:
+            break
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,21 @@ CREATE TABLE IF NOT EXISTS events (
     poster_caption TEXT,
     hashtags TEXT,
     volunteer_contacts TEXT,
-    created_at TEXT DEFAULT (datetime('now'))
+    created_at TEXT DEFAULT (datetime('now')),
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+
+-- Deleted event ids, so incremental sync (/api/sync) can report deletions
+CREATE TABLE IF NOT EXISTS event_tombstones (
+    event_id INTEGER PRIMARY KEY,
+    deleted_at TEXT DEFAULT (datetime('now'))
+);
+
+-- Last health report from the bot (one row), shown on the admin health page
+CREATE TABLE IF NOT EXISTS bot_heartbeat (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    report TEXT NOT NULL,
+    received_at TEXT DEFAULT (datetime('now'))
 );
 
 -- Announcements
@@ -35,6 +49,8 @@ CREATE TABLE IF NOT EXISTS announcements (
     priority TEXT DEFAULT 'normal',
     scheduled_at TEXT,
     sent_at TEXT,
+    delivery_cursor INTEGER DEFAULT 0,
+    delivered_count INTEGER DEFAULT 0,
     created_at TEXT DEFAULT (datetime('now'))
 );
 
@@ -47,6 +63,41 @@ CREATE TABLE IF NOT EXISTS telemetry (
     created_at TEXT DEFAULT (datetime('now'))
 );
 
+-- Dashboard rollups of telemetry, maintained incrementally by rollup_telemetry.py.
+-- Buckets are fest-local 'YYYY-MM-DD HH:00:00' / 'YYYY-MM-DD'; event is '' unless
+-- the action is about an event (view_event).
+CREATE TABLE IF NOT EXISTS telemetry_hourly (
+    hour TEXT NOT NULL,
+    action TEXT NOT NULL,
+    event TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, action, event)
+);
+
+CREATE TABLE IF NOT EXISTS telemetry_daily (
+    day TEXT NOT NULL,
+    action TEXT NOT NULL,
+    event TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, action, event)
+);
+
+CREATE TABLE IF NOT EXISTS telemetry_daily_users (
+    day TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (day, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS telemetry_dau (
+    day TEXT PRIMARY KEY,
+    users INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS telemetry_rollup_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
 -- CMS Content
 CREATE TABLE IF NOT EXISTS content_pages (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -66,6 +117,13 @@ CREATE TABLE IF NOT EXISTS admins (
 
 -- Create indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_events_category ON events(category);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_name ON events(name);
 CREATE INDEX IF NOT EXISTS idx_events_active ON events(is_active);
+CREATE INDEX IF NOT EXISTS idx_events_updated ON events(updated_at);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_time, id);
+CREATE INDEX IF NOT EXISTS idx_content_updated ON content_pages(updated_at);
+CREATE INDEX IF NOT EXISTS idx_tombstones_deleted ON event_tombstones(deleted_at);
+CREATE INDEX IF NOT EXISTS idx_announcements_pending ON announcements(sent_at);
 CREATE INDEX IF NOT EXISTS idx_telemetry_user ON telemetry(user_id);
 CREATE INDEX IF NOT EXISTS idx_telemetry_action ON telemetry(action);
+CREATE INDEX IF NOT EXISTS idx_telemetry_daily_action ON telemetry_daily(action, day);
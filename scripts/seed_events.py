@@ -1,70 +1,87 @@
 import os
 import csv
 import json
-from turso_db import execute_sql, fetch_one
+import time
+from turso_db import execute_many, execute_sql, fetch_one
+
+# Events are keyed by name (unique index idx_events_name); reseeding updates in place
+# and leaves admin-managed columns (poster, is_active, results) alone
+UPSERT_EVENT = """
+    INSERT INTO events
+    (name, category, description, venue, start_time, end_time, rules, hashtags, volunteer_contacts, poster_caption, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(name) DO UPDATE SET
+        category = excluded.category, description = excluded.description, venue = excluded.venue,
+        start_time = excluded.start_time, end_time = excluded.end_time, rules = excluded.rules,
+        hashtags = excluded.hashtags, volunteer_contacts = excluded.volunteer_contacts,
+        poster_caption = excluded.poster_caption, updated_at = excluded.updated_at
+"""
+
+# Statements per HTTP request
+BATCH_SIZE = 500
+
+def restamp(table: str, since: str):
+    """Statement that moves updated_at of rows written since `since` to now. Sent with
+    COMMIT, so /api/sync never hands out a cursor past rows it can't see yet."""
+    return f"UPDATE {table} SET updated_at = datetime('now') WHERE updated_at >= ?", [since]
+
+def db_now() -> str:
+    return fetch_one("SELECT datetime('now') AS now").now
+
+def event_upserts(reader, skipped: list):
+    """Yield an upsert per CSV row, one row at a time. Rows without a name go to skipped."""
+    for line, row in enumerate(reader, 2):
+        name = (row.get('name') or '').strip()
+        if not name:
+            skipped.append(line)
+            continue
+        yield UPSERT_EVENT, [
+            name,
+            row.get('category', ''),
+            row.get('description', ''),
+            row.get('venue', ''),
+            row.get('start_time', ''),
+            row.get('end_time', ''),
+            row.get('rules', ''),
+            row.get('hashtags', ''),
+            row.get('volunteer_contacts', '[]'),
+            row.get('poster_caption', '')
+        ]
 
 def seed_events(csv_path: str):
-    """Seed events from CSV file."""
+    """Seed events from CSV file: streamed, upserted in pipelined batches, all in one transaction."""
     if not os.path.exists(csv_path):
         print(f"❌ CSV file not found: {csv_path}")
         print("   Create events.csv with columns: name,category,description,venue,start_time,end_time")
         return False
-    
+
+    try:
+        execute_sql("CREATE UNIQUE INDEX IF NOT EXISTS idx_events_name ON events(name)")
+    except Exception as e:
+        print(f"❌ Could not create the unique index on events.name: {e}")
+        print("   Remove duplicate event names first (SELECT name, COUNT(*) FROM events GROUP BY name HAVING COUNT(*) > 1)")
+        return False
+
+    skipped = []
+    started = time.monotonic()
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        count = 0
-        
-        for row in reader:
-            try:
-                # Check if event already exists
-                existing = fetch_one("SELECT id FROM events WHERE name = ?", [row.get('name', '')])
-                
-                if existing:
-                    # Update existing
-                    execute_sql("""
-                        UPDATE events SET 
-                            category = ?, description = ?, venue = ?,
-                            start_time = ?, end_time = ?, rules = ?,
-                            hashtags = ?, volunteer_contacts = ?, poster_caption = ?
-                        WHERE name = ?
-                    """, [
-                        row.get('category', ''),
-                        row.get('description', ''),
-                        row.get('venue', ''),
-                        row.get('start_time', ''),
-                        row.get('end_time', ''),
-                        row.get('rules', ''),
-                        row.get('hashtags', ''),
-                        row.get('volunteer_contacts', '[]'),
-                        row.get('poster_caption', ''),
-                        row.get('name', '')
-                    ])
-                    print(f"   ✓ Updated: {row.get('name', 'Unknown')}")
-                else:
-                    # Insert new
-                    execute_sql("""
-                        INSERT INTO events 
-                        (name, category, description, venue, start_time, end_time, rules, hashtags, volunteer_contacts, poster_caption)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, [
-                        row.get('name', ''),
-                        row.get('category', ''),
-                        row.get('description', ''),
-                        row.get('venue', ''),
-                        row.get('start_time', ''),
-                        row.get('end_time', ''),
-                        row.get('rules', ''),
-                        row.get('hashtags', ''),
-                        row.get('volunteer_contacts', '[]'),
-                        row.get('poster_caption', '')
-                    ])
-                    print(f"   ✓ Added: {row.get('name', 'Unknown')}")
-                count += 1
-            except Exception as e:
-                print(f"   ❌ Error with {row.get('name', 'Unknown')}: {e}")
-        
-        print(f"\n✅ Seeded {count} events!")
-        return True
+        try:
+            since = db_now()
+            count = execute_many(
+                event_upserts(csv.DictReader(f), skipped), chunk_size=BATCH_SIZE,
+                progress=lambda n: print(f"   ✓ {n} rows sent"),
+                at_commit=[restamp("events", since)]
+            )
+        except Exception as e:
+            print(f"❌ Seeding failed, nothing was written: {e}")
+            return False
+
+    elapsed = time.monotonic() - started
+    if skipped:
+        print(f"   ⚠️ Skipped {len(skipped)} rows without a name (lines {', '.join(map(str, skipped[:10]))})")
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"\n✅ Seeded {count} events in {elapsed:.1f}s ({rate:.0f} rows/s)")
+    return True
 
 def seed_content():
     """Seed default content pages."""
@@ -82,16 +99,20 @@ def seed_content():
         "about": "Brahma 26 is the annual cultural and technical fest of our college. Join us for three days of exciting events, competitions, and performances!"
     }
     
-    for key, content in default_content.items():
-        try:
-            existing = fetch_one("SELECT id FROM content_pages WHERE key = ?", [key])
-            if existing:
-                execute_sql("UPDATE content_pages SET content = ?, updated_at = datetime('now') WHERE key = ?", [content, key])
-            else:
-                execute_sql("INSERT INTO content_pages (key, content) VALUES (?, ?)", [key, content])
-            print(f"   ✓ Seeded: {key}")
-        except Exception as e:
-            print(f"   ❌ Error seeding {key}: {e}")
+    try:
+        since = db_now()
+        execute_many(
+            (("""INSERT INTO content_pages (key, content, updated_at) VALUES (?, ?, datetime('now'))
+                ON CONFLICT(key) DO UPDATE SET content = excluded.content, updated_at = excluded.updated_at""",
+              [key, content])
+             for key, content in default_content.items()),
+            at_commit=[restamp("content_pages", since)]
+        )
+    except Exception as e:
+        print(f"   ❌ Error seeding content: {e}")
+        return False
+    for key in default_content:
+        print(f"   ✓ Seeded: {key}")
     
     print("\n✅ Default content seeded!")
     return True
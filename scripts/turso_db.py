@@ -1,9 +1,21 @@
 """
 Turso Database Helper
 Common functions for Turso HTTP API access.
+
+All helpers share one TursoClient: a persistent HTTPS session plus an open Hrana
+stream (baton) that is reused between calls instead of being closed after each one.
+
+TURSO_DATABASE_URL=file:path/to.db runs everything against a local SQLite file
+instead (no network, no auth token), e.g. the bot's replica or a test database.
 """
 import os
+import atexit
+import base64
+import sqlite3
+import itertools
 import requests
+from collections import namedtuple
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load .env from project root
@@ -13,57 +25,390 @@ def get_turso_config():
     """Get Turso URL and auth token from environment."""
     url = os.getenv("TURSO_DATABASE_URL", "")
     auth_token = os.getenv("TURSO_AUTH_TOKEN", "")
-    
+
     # Convert libsql:// to https://
     if url.startswith("libsql://"):
         url = url.replace("libsql://", "https://")
-    
+
     return url, auth_token
 
-def execute_sql(sql: str, params=None):
-    """Execute SQL via Turso HTTP API."""
-    url, auth_token = get_turso_config()
-    
-    if not url or not auth_token:
-        raise ValueError("TURSO_DATABASE_URL and TURSO_AUTH_TOKEN must be set in .env")
-    
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json"
-    }
-    
+class TursoError(Exception):
+    """A statement was rejected by the database."""
+
+def _encode_arg(value):
+    """Hrana value for a Python parameter."""
+    if value is None:
+        return {"type": "null"}
+    if isinstance(value, (bool, int)):
+        return {"type": "integer", "value": str(int(value))}
+    if isinstance(value, float):
+        return {"type": "float", "value": value}
+    if isinstance(value, bytes):
+        return {"type": "blob", "base64": base64.b64encode(value).decode()}
+    return {"type": "text", "value": str(value)}
+
+def _sql_stmt(sql: str, params=None):
     stmt = {"sql": sql}
     if params:
-        stmt["args"] = [{"type": "text", "value": str(p)} if isinstance(p, str) else {"type": "integer", "value": p} for p in params]
-    
-    payload = {
-        "requests": [
-            {"type": "execute", "stmt": stmt},
-            {"type": "close"}
-        ]
-    }
-    
-    response = requests.post(f"{url}/v2/pipeline", headers=headers, json=payload)
-    result = response.json()
-    
-    results = result.get("results", [])
-    if results and results[0].get("type") == "ok":
-        return results[0].get("response", {}).get("result", {})
-    elif results and results[0].get("type") == "error":
-        raise Exception(results[0].get("error", {}).get("message", "Unknown error"))
-    
-    return None
+        stmt["args"] = [_encode_arg(p) for p in params]
+    return stmt
+
+def _stmt(sql: str, params=None):
+    return {"type": "execute", "stmt": _sql_stmt(sql, params)}
+
+def _error(item) -> TursoError:
+    return TursoError(item.get("error", {}).get("message", "Unknown error"))
+
+# Hrana errors meaning the baton no longer names a live stream; nothing was executed
+STREAM_LOST_CODES = {"STREAM_EXPIRED", "BATON_INVALID", "BATON_REUSED", "BATON_STREAM_CLOSED"}
+
+def _stream_lost(response: requests.Response) -> bool:
+    """Whether a pipeline request failed only because its stream is gone (safe to resend)."""
+    if response.status_code not in (400, 404):
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and body.get("code") in STREAM_LOST_CODES
+
+def decode_value(value: dict):
+    """Python value for a Hrana value (integers arrive as strings, blobs as base64)."""
+    kind = value.get("type")
+    if kind == "null":
+        return None
+    if kind == "integer":
+        return int(value["value"])
+    if kind == "float":
+        return float(value["value"])
+    if kind == "blob":
+        return base64.b64decode(value.get("base64", ""))
+    return value.get("value")
+
+@lru_cache(maxsize=128)
+def row_type(columns: tuple):
+    """namedtuple class for a column list; names that aren't identifiers become _0, _1..."""
+    return namedtuple("Row", columns, rename=True)
+
+class ResultSet:
+    """Rows of one statement, decoded one at a time as they are read.
+
+    Rows are named tuples (row.name, row[0]); columns holds the column names.
+    """
+
+    __slots__ = ("columns", "rows_affected", "last_insert_rowid", "_raw", "_type")
+
+    def __init__(self, result: dict):
+        self.columns = tuple(col.get("name") or f"column{i}" for i, col in enumerate(result.get("cols", [])))
+        self.rows_affected = result.get("affected_row_count", 0)
+        rowid = result.get("last_insert_rowid")
+        self.last_insert_rowid = int(rowid) if rowid is not None else None
+        self._raw = result.get("rows", [])
+        self._type = row_type(self.columns)
+
+    def _decode(self, raw: list):
+        return self._type._make(decode_value(v) for v in raw)
+
+    def __iter__(self):
+        return (self._decode(raw) for raw in self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __getitem__(self, index: int):
+        return self._decode(self._raw[index])
+
+    def first(self):
+        """The first row, or None."""
+        return self._decode(self._raw[0]) if self._raw else None
+
+def _normalize(statements):
+    """Accept bare SQL strings as well as (sql, params) pairs."""
+    for statement in statements:
+        yield (statement, None) if isinstance(statement, str) else statement
+
+class TursoClient:
+    """Connection to one Turso database over the Hrana HTTP pipeline API.
+
+    Config is read once. Requests go through a requests.Session (one TLS connection),
+    and the stream's baton is carried from call to call, so a script's statements run
+    on one server-side connection. If the server has expired an idle stream, the next
+    call transparently opens a new one (unless a transaction was open on it).
+    """
+
+    def __init__(self, url: str = None, auth_token: str = None, timeout: float = 30):
+        if url is None or auth_token is None:
+            url, auth_token = get_turso_config()
+        if not url or not auth_token:
+            raise ValueError("TURSO_DATABASE_URL and TURSO_AUTH_TOKEN must be set in .env")
+
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {auth_token}",
+            "Content-Type": "application/json"
+        })
+        self._baton = None
+        self._base_url = url
+        self._in_transaction = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def pipeline(self, requests_: list) -> list:
+        """Send raw Hrana requests in one round trip on the current stream; returns their results."""
+        response = self._post(requests_)
+        if self._baton and not self._in_transaction and _stream_lost(response):
+            # The server dropped the stream before running anything: start a fresh one
+            self._baton, self._base_url = None, self.url
+            response = self._post(requests_)
+        response.raise_for_status()
+
+        result = response.json()
+        self._baton = result.get("baton")
+        self._base_url = result.get("base_url") or self._base_url
+        return result.get("results", [])
+
+    def _post(self, requests_: list) -> requests.Response:
+        return self.session.post(
+            f"{self._base_url}/v2/pipeline",
+            json={"baton": self._baton, "requests": requests_},
+            timeout=self.timeout
+        )
+
+    def execute(self, sql: str, params=None) -> dict:
+        """Run one statement and return its raw result (cols, rows, affected_row_count...)."""
+        item = self.pipeline([_stmt(sql, params)])[0]
+        if item.get("type") == "error":
+            raise _error(item)
+        return item.get("response", {}).get("result", {})
+
+    def query(self, sql: str, params=None) -> ResultSet:
+        """Run one statement and return its decoded rows."""
+        return ResultSet(self.execute(sql, params))
+
+    def iter_rows(self, table: str, columns: str = "*", where: str = "1", params=None,
+                  key: str = "id", page_size: int = 1000):
+        """Yield every matching row of a large table, page_size rows per request.
+
+        Pages with keyset paging on `key` (WHERE key > last ORDER BY key LIMIT n), so
+        each page is an index range scan and memory stays at one page. `key` must be a
+        unique, indexed column included in `columns`.
+        """
+        last = None
+        while True:
+            condition = f"({where})" if last is None else f"({where}) AND {key} > ?"
+            page = self.query(
+                f"SELECT {columns} FROM {table} WHERE {condition} ORDER BY {key} LIMIT ?",
+                list(params or []) + ([] if last is None else [last]) + [page_size]
+            )
+            if not len(page):
+                return
+            position = page.columns.index(key)
+            for row in page:
+                yield row
+            last = row[position]
+            if len(page) < page_size:
+                return
+
+    def batch(self, statements, atomic: bool = True) -> list:
+        """Run many statements in a single round trip.
+
+        statements are SQL strings or (sql, params) pairs. With atomic=True they run
+        as one transaction (a Hrana batch: each step only runs if the previous one
+        succeeded) and a TursoError is raised if any fails, after rolling back.
+        With atomic=False every statement runs independently and the returned list
+        holds a TursoError in place of each failed result.
+        """
+        statements = list(_normalize(statements))
+        if not atomic:
+            results = self.pipeline([_stmt(sql, params) for sql, params in statements])
+            return [
+                _error(item) if item.get("type") == "error" else item.get("response", {}).get("result", {})
+                for item in results
+            ]
+
+        steps = [{"stmt": {"sql": "BEGIN"}}]
+        for sql, params in statements:
+            steps.append({"stmt": _sql_stmt(sql, params), "condition": {"type": "ok", "step": len(steps) - 1}})
+        commit = len(steps)
+        steps.append({"stmt": {"sql": "COMMIT"}, "condition": {"type": "ok", "step": commit - 1}})
+        steps.append({"stmt": {"sql": "ROLLBACK"},
+                      "condition": {"type": "not", "cond": {"type": "ok", "step": commit}}})
+
+        item = self.pipeline([{"type": "batch", "batch": {"steps": steps}}])[0]
+        if item.get("type") == "error":
+            raise _error(item)
+        batch = item["response"]["result"]
+        for error in batch.get("step_errors", [])[:commit + 1]:
+            if error:
+                raise TursoError(error.get("message", "Unknown error"))
+        return batch.get("step_results", [])[1:commit]
+
+    def transaction(self, statements, chunk_size: int = 500, progress=None, at_commit=()) -> int:
+        """Run (sql, params) pairs in one transaction, chunk_size statements per HTTP request.
+
+        For more statements than fit in one request. statements may be a generator;
+        it is consumed one chunk at a time. at_commit statements are sent in the same
+        request as COMMIT (e.g. to stamp rows with the commit time). On any error the
+        transaction is rolled back and the error raised. Returns the number of
+        statements run.
+        """
+        statements = _normalize(statements)
+        begin = [_stmt("BEGIN")]
+        total = 0
+        try:
+            while True:
+                chunk = list(itertools.islice(statements, chunk_size))
+                if not chunk:
+                    break
+                # BEGIN rides along with the first chunk
+                results = self.pipeline(begin + [_stmt(sql, params) for sql, params in chunk])
+                begin = []
+                self._in_transaction = True
+                for item in results:
+                    if item.get("type") == "error":
+                        raise _error(item)
+                total += len(chunk)
+                if progress:
+                    progress(total)
+            if total:
+                final = [_stmt(sql, params) for sql, params in _normalize(at_commit)]
+                for item in self.pipeline(final + [_stmt("COMMIT")]):
+                    if item.get("type") == "error":
+                        raise _error(item)
+        except Exception:
+            if self._in_transaction:
+                try:
+                    self.execute("ROLLBACK")
+                except Exception:
+                    pass
+            raise
+        finally:
+            self._in_transaction = False
+        return total
+
+    def close(self):
+        """Close the server-side stream and the HTTP session."""
+        if self._baton:
+            try:
+                self.pipeline([{"type": "close"}])
+            except Exception:
+                pass
+            self._baton = None
+        self.session.close()
+
+class LocalClient(TursoClient):
+    """TursoClient over a local SQLite file: same API, statements run in-process.
+
+    Hrana requests are executed directly against sqlite3, so batch(), transaction()
+    and iter_rows() behave exactly as they do against Turso.
+    """
+
+    def __init__(self, path: str):
+        self.url = f"file:{path}"
+        self._in_transaction = False
+        # Autocommit; transactions are the explicit BEGIN/COMMIT the client sends
+        self.conn = sqlite3.connect(path, isolation_level=None)
+
+    def pipeline(self, requests_: list) -> list:
+        results = []
+        for request in requests_:
+            if request["type"] == "execute":
+                try:
+                    results.append({"type": "ok", "response": {"type": "execute", "result": self._run(request["stmt"])}})
+                except sqlite3.Error as e:
+                    results.append({"type": "error", "error": {"message": str(e)}})
+            elif request["type"] == "batch":
+                results.append({"type": "ok", "response": {"type": "batch", "result": self._batch(request["batch"]["steps"])}})
+            else:
+                results.append({"type": "ok", "response": {"type": request["type"]}})
+        return results
+
+    def _run(self, stmt: dict) -> dict:
+        cursor = self.conn.execute(stmt["sql"], [decode_value(arg) for arg in stmt.get("args", [])])
+        rows = cursor.fetchall()
+        return {
+            "cols": [{"name": column[0]} for column in cursor.description or []],
+            "rows": [[_encode_arg(value) for value in row] for row in rows],
+            "affected_row_count": max(cursor.rowcount, 0),
+            "last_insert_rowid": str(cursor.lastrowid) if cursor.lastrowid else None
+        }
+
+    def _batch(self, steps: list) -> dict:
+        results, errors = [], []
+
+        def holds(condition) -> bool:
+            if condition is None:
+                return True
+            kind = condition["type"]
+            if kind == "ok":
+                return results[condition["step"]] is not None
+            if kind == "error":
+                return errors[condition["step"]] is not None
+            if kind == "not":
+                return not holds(condition["cond"])
+            if kind == "and":
+                return all(holds(c) for c in condition["conds"])
+            return any(holds(c) for c in condition["conds"])
+
+        for step in steps:
+            result = error = None
+            if holds(step.get("condition")):
+                try:
+                    result = self._run(step["stmt"])
+                except sqlite3.Error as e:
+                    error = {"message": str(e)}
+            results.append(result)
+            errors.append(error)
+        return {"step_results": results, "step_errors": errors}
+
+    def close(self):
+        self.conn.close()
+
+def connect(url: str = None, auth_token: str = None) -> TursoClient:
+    """Client for TURSO_DATABASE_URL: Turso over HTTP, or a local file for file: URLs."""
+    if url is None:
+        url, auth_token = get_turso_config()
+    if url.startswith("file:"):
+        return LocalClient(url[len("file:"):])
+    return TursoClient(url, auth_token)
+
+_client = None
+
+def get_client() -> TursoClient:
+    """The shared client for this process (created on first use)."""
+    global _client
+    if _client is None:
+        _client = connect()
+        atexit.register(_client.close)
+    return _client
+
+def execute_sql(sql: str, params=None):
+    """Execute SQL via Turso HTTP API."""
+    return get_client().execute(sql, params)
+
+def query(sql: str, params=None) -> ResultSet:
+    """Execute SQL and return the decoded result (iterate it for rows)."""
+    return get_client().query(sql, params)
 
 def fetch_all(sql: str, params=None):
-    """Execute SQL and return all rows."""
-    result = execute_sql(sql, params)
-    if result:
-        rows = result.get("rows", [])
-        # Convert from Turso format to simple tuples
-        return [[col.get("value") for col in row] for row in rows]
-    return []
+    """Execute SQL and return all rows as named tuples with typed values."""
+    return list(query(sql, params))
 
 def fetch_one(sql: str, params=None):
     """Execute SQL and return first row."""
-    rows = fetch_all(sql, params)
-    return rows[0] if rows else None
+    return query(sql, params).first()
+
+def iter_rows(table: str, columns: str = "*", where: str = "1", params=None,
+              key: str = "id", page_size: int = 1000):
+    """Stream a large table in keyset-paged chunks; see TursoClient.iter_rows."""
+    return get_client().iter_rows(table, columns, where, params, key, page_size)
+
+def execute_many(statements, chunk_size: int = 500, progress=None, at_commit=()) -> int:
+    """Run (sql, params) pairs in one transaction; see TursoClient.transaction."""
+    return get_client().transaction(statements, chunk_size, progress, at_commit)
@@ -6,30 +6,141 @@ Usage:
 1. Place poster images in posters/ folder
 2. Create events.csv with event details
 3. Run: python upload_posters.py
+
+Posters are resized to Telegram's display size (POSTER_MAX_SIDE, POSTER_MAX_BYTES)
+and identical files share one upload. POSTER_NEAR_DUPLICATE_DISTANCE (default 0, off)
+lists look-alike posters for a human to check; they are still uploaded separately.
+Reruns only upload new or changed files (tracked in posters/.upload_manifest.json).
+UPLOAD_CONCURRENCY (default 4) sets parallel uploads, UPLOAD_DB_BATCH (default 25)
+how many file_ids are written per transaction.
 """
 import os
 import json
+import time
 import asyncio
+import hashlib
+from datetime import timedelta
 import libsql_experimental as libsql
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from poster_prep import find_near_duplicate, prepare_posters, savings
+
 # Import telegram only when needed
 try:
     from telegram import Bot
+    from telegram.error import NetworkError, RetryAfter
 except ImportError:
     print("❌ Please install python-telegram-bot: pip install python-telegram-bot")
     exit(1)
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Per-directory record of what has been uploaded, so reruns skip unchanged files
+MANIFEST_NAME = ".upload_manifest.json"
+# Resized copies that actually get uploaded
+PREPARED_DIR = ".prepared"
+
+class AdaptiveRateLimiter:
+    """Spaces uploads out; slows down on RetryAfter and speeds back up on success."""
+
+    def __init__(self, interval: float = 0.5, min_interval: float = 0.05, max_interval: float = 10.0):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        """Wait for the next upload slot."""
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        await asyncio.sleep(start - now)
+
+    def success(self):
+        self.interval = max(self.min_interval, self.interval * 0.9)
+
+    def retry_after(self, seconds: float):
+        """Telegram asked us to wait: hold everyone back and halve the rate."""
+        self.interval = min(self.max_interval, self.interval * 2)
+        self._next = max(self._next, time.monotonic() + seconds)
+
+def file_sha256(path: str) -> str:
+    """Content hash of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(posters_dir: str) -> dict:
+    path = os.path.join(posters_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(posters_dir: str, manifest: dict):
+    """Write the manifest atomically so a crash never leaves it half-written."""
+    path = os.path.join(posters_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
 async def upload_poster(bot: Bot, image_path: str, chat_id: str) -> str:
     """Upload a poster to Telegram and return the file_id."""
     with open(image_path, "rb") as photo:
         message = await bot.send_photo(chat_id=chat_id, photo=photo)
         return message.photo[-1].file_id
 
+async def upload_with_retry(bot: Bot, image_path: str, chat_id: str,
+                            limiter: AdaptiveRateLimiter, attempts: int = 5) -> str:
+    """Upload within the rate limit, retrying on flood control and network errors."""
+    for attempt in range(attempts):
+        await limiter.wait()
+        try:
+            file_id = await upload_poster(bot, image_path, chat_id)
+            limiter.success()
+            return file_id
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            print(f"   ⏳ Rate limited, waiting {retry_after}s")
+            limiter.retry_after(float(retry_after))
+        except NetworkError as e:
+            if attempt == attempts - 1:
+                raise
+            print(f"   ⚠️ Network error ({e}), retrying")
+            await asyncio.sleep(2 ** attempt)
+    raise RuntimeError(f"Gave up after {attempts} attempts")
+
+def store_file_ids(db_conn, rows: list):
+    """Write (event_name, file_id) pairs in one transaction; unknown names become new events."""
+    for event_name, file_id in rows:
+        db_conn.execute(
+            "UPDATE events SET poster_file_id = ?, updated_at = datetime('now') WHERE name = ?",
+            (file_id, event_name)
+        )
+        db_conn.execute(
+            """INSERT INTO events (name, poster_file_id, start_time, end_time, updated_at)
+               SELECT ?, ?, datetime('now'), datetime('now', '+2 hours'), datetime('now')
+               WHERE NOT EXISTS (SELECT 1 FROM events WHERE name = ?)""",
+            (event_name, file_id, event_name)
+        )
+    db_conn.commit()
+
 async def upload_all_posters(posters_dir: str, db_conn):
-    """Upload all posters from directory and update database."""
+    """Upload new or changed posters in parallel and update the database in batches.
+
+    Posters are resized and recompressed first, and files with identical content
+    (same sha256) are uploaded once and share the file_id. Safe to rerun: files whose
+    content hash matches the manifest are skipped, and uploads that never reached the
+    database are written without re-uploading.
+    """
     bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
     admin_chat_id = os.getenv("ADMIN_CHAT_ID")  # Your personal chat ID to receive uploads
     
@@ -42,51 +153,135 @@ async def upload_all_posters(posters_dir: str, db_conn):
         print("   Get your chat ID by sending a message to @userinfobot on Telegram")
         return
     
-    bot = Bot(token=bot_token)
-    
+    concurrency = int(os.getenv("UPLOAD_CONCURRENCY", 4))
+    batch_size = int(os.getenv("UPLOAD_DB_BATCH", 25))
+
     # Get list of image files
-    image_extensions = ('.jpg', '.jpeg', '.png', '.webp')
-    posters = [f for f in os.listdir(posters_dir) if f.lower().endswith(image_extensions)]
-    
+    posters = sorted(f for f in os.listdir(posters_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
     print(f"📸 Found {len(posters)} poster images")
-    
-    for i, poster_file in enumerate(posters, 1):
-        image_path = os.path.join(posters_dir, poster_file)
-        event_name = os.path.splitext(poster_file)[0]  # Use filename as event name
-        
-        print(f"[{i}/{len(posters)}] Uploading: {poster_file}")
-        
-        try:
-            file_id = await upload_poster(bot, image_path, admin_chat_id)
-            
-            # Update or insert event
-            existing = db_conn.execute(
-                "SELECT id FROM events WHERE name = ?", 
-                (event_name,)
-            ).fetchone()
-            
-            if existing:
-                db_conn.execute(
-                    "UPDATE events SET poster_file_id = ? WHERE name = ?",
-                    (file_id, event_name)
-                )
-            else:
-                db_conn.execute(
-                    """INSERT INTO events (name, poster_file_id, start_time, end_time)
-                       VALUES (?, ?, datetime('now'), datetime('now', '+2 hours'))""",
-                    (event_name, file_id)
-                )
-            
-            db_conn.commit()
-            print(f"   ✅ Stored file_id for: {event_name}")
-            
-            # Small delay to avoid rate limits
-            await asyncio.sleep(0.5)
-            
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-    
-    print(f"\n✅ Upload complete! {len(posters)} posters processed.")
+
+    manifest = load_manifest(posters_dir)
+    hashes = await asyncio.gather(*(
+        asyncio.to_thread(file_sha256, os.path.join(posters_dir, f)) for f in posters
+    ))
+
+    to_upload, to_store = [], []
+    for poster_file, sha in zip(posters, hashes):
+        entry = manifest.get(poster_file)
+        if entry and entry["sha256"] == sha:
+            if not entry.get("stored"):
+                to_store.append(poster_file)
+        else:
+            to_upload.append((poster_file, sha))
+
+    skipped = len(posters) - len(to_upload) - len(to_store)
+    print(f"   {skipped} unchanged, {len(to_upload)} to upload, {len(to_store)} to resume")
+
+    pending_rows = []
+    db_lock = asyncio.Lock()
+
+    async def flush(force: bool = False):
+        """Write queued file_ids once a batch is full (or whatever is left if force)."""
+        async with db_lock:
+            if not pending_rows or (len(pending_rows) < batch_size and not force):
+                return
+            batch = pending_rows[:]
+            del pending_rows[:]
+            store_file_ids(db_conn, [(manifest[f]["event"], manifest[f]["file_id"]) for f in batch])
+            for poster_file in batch:
+                manifest[poster_file]["stored"] = True
+            save_manifest(posters_dir, manifest)
+            print(f"   💾 Stored {len(batch)} file_ids")
+
+    for poster_file in to_store:
+        pending_rows.append(poster_file)
+        await flush()
+
+    def record(poster_file: str, sha: str, fingerprint: int, file_id: str):
+        # Use filename as event name
+        manifest[poster_file] = {
+            "sha256": sha,
+            "dhash": fingerprint,
+            "file_id": file_id,
+            "event": os.path.splitext(poster_file)[0],
+            "stored": False
+        }
+        pending_rows.append(poster_file)
+
+    # Resize across CPU cores; identical files share one entry (keyed by content hash)
+    prepared = await asyncio.to_thread(
+        prepare_posters,
+        {sha: os.path.join(posters_dir, f) for f, sha in to_upload},
+        os.path.join(posters_dir, PREPARED_DIR)
+    )
+    if prepared:
+        print(f"   🗜️ Prepared {len(prepared)} images: {savings(list(prepared.values()))}")
+    # Unreadable files were reported by prepare_posters; count them as failed
+    unreadable = sum(sha not in prepared for _, sha in to_upload)
+    to_upload = [(poster_file, sha) for poster_file, sha in to_upload if sha in prepared]
+
+    # Identical files reuse an earlier upload, or share one upload in this run
+    known = {e["sha256"]: e["file_id"] for e in manifest.values() if e.get("file_id")}
+    # Look-alikes are only reported: same-template posters differ in text a hash can't see
+    fingerprints = {e["dhash"]: f for f, e in manifest.items() if e.get("dhash") is not None}
+    groups, near = {}, []
+    reused = 0
+    for poster_file, sha in to_upload:
+        fingerprint = prepared[sha].dhash
+        file_id = known.get(sha)
+        if file_id:
+            record(poster_file, sha, fingerprint, file_id)
+            reused += 1
+            continue
+        if sha in groups:
+            groups[sha].append((poster_file, sha))
+            continue
+        groups[sha] = [(poster_file, sha)]
+        similar = find_near_duplicate(fingerprint, fingerprints)
+        if similar:
+            near.append((poster_file, similar))
+        fingerprints.setdefault(fingerprint, poster_file)
+    if len(groups) < len(to_upload):
+        print(f"   ♻️ {len(to_upload) - len(groups)} identical files will reuse an existing file_id")
+    for poster_file, similar in near:
+        print(f"   👀 {poster_file} looks like {similar}, check it isn't a duplicate")
+    await flush()
+
+    limiter = AdaptiveRateLimiter()
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+    started = time.monotonic()
+
+    async with Bot(token=bot_token) as bot:
+        async def process(i: int, members: list):
+            nonlocal failed
+            poster_file, sha = members[0]
+            async with semaphore:
+                print(f"[{i}/{len(groups)}] Uploading: {poster_file}")
+                try:
+                    file_id = await upload_with_retry(bot, prepared[sha].path, admin_chat_id, limiter)
+                except Exception as e:
+                    failed += len(members)
+                    print(f"   ❌ {poster_file}: {e}")
+                    return
+
+            for member_file, member_sha in members:
+                record(member_file, member_sha, prepared[member_sha].dhash, file_id)
+            # Record the upload before the DB write, so a crash in between doesn't re-upload
+            save_manifest(posters_dir, manifest)
+            await flush()
+
+        await asyncio.gather(*(
+            process(i, members) for i, members in enumerate(groups.values(), 1)
+        ))
+
+    await flush(force=True)
+
+    elapsed = time.monotonic() - started
+    uploaded = len(to_upload) - failed
+    rate = uploaded / elapsed if elapsed > 0 else 0.0
+    print(f"\n✅ Upload complete! {uploaded} updated ({len(groups)} uploads), {skipped} unchanged, {failed + unreadable} failed "
+          f"({elapsed:.1f}s, {rate:.1f} posters/s)")
 
 def main():
     """Main entry point."""